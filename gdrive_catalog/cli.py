@@ -17,14 +17,22 @@
 """CLI interface for Google Drive Catalog."""
 
 import csv
+import os
+from collections.abc import Iterable, Iterator
+from itertools import batched
+from operator import itemgetter
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Any
 
 import typer
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
-from gdrive_catalog.csv_validator import CATALOG_FIELDNAMES, load_catalog_csv
+from gdrive_catalog.csv_validator import (
+    CATALOG_FIELDNAMES,
+    iter_catalog_csv,
+    validate_catalog_csv,
+)
 from gdrive_catalog.drive_service import DriveService
 from gdrive_catalog.exceptions import CSVValidationError
 from gdrive_catalog.scanner import DriveScanner
@@ -35,6 +43,14 @@ app = typer.Typer(
 )
 console = Console()
 
+# Write buffer for catalog files; large buffers keep write syscalls rare
+DEFAULT_CSV_BUFFER_BYTES = 1 << 20
+
+# Number of rows handed to csv.writer.writerows at a time
+WRITE_BATCH_ROWS = 1000
+
+_project_catalog_row = itemgetter(*CATALOG_FIELDNAMES)
+
 
 @app.command()
 def scan(
@@ -71,6 +87,14 @@ def scan(
             help="Output CSV file path",
         ),
     ] = Path("catalog.csv"),
+    csv_buffer_bytes: Annotated[
+        int,
+        typer.Option(
+            "--csv-buffer-bytes",
+            min=1,
+            help="Write buffer size in bytes for the output CSV (tune for network filesystems)",
+        ),
+    ] = DEFAULT_CSV_BUFFER_BYTES,
 ):
     """
     Scan Google Drive and generate a CSV catalog with file metadata.
@@ -97,12 +121,12 @@ def scan(
         drive_service = DriveService(credentials_path=str(credentials))
         scanner = DriveScanner(drive_service)
 
-        # Load existing data if updating
-        existing_data = {}
-        if update and output.exists():
-            console.print(f"[cyan]Loading existing catalog from {output}...[/cyan]")
+        # Check the existing catalog up front; its rows are streamed during the merge
+        merge_existing = update and os.path.exists(output)
+        if merge_existing:
+            console.print(f"[cyan]Checking existing catalog at {output}...[/cyan]")
             try:
-                existing_data = load_catalog_csv(output)
+                validate_catalog_csv(output)
             except CSVValidationError as e:
                 console.print(f"[red]Error: {e}[/red]")
                 console.print(
@@ -114,41 +138,39 @@ def scan(
                     "3. Specify a different output file with --output\n"
                 )
                 raise typer.Exit(1) from None
-            console.print(f"[green]Loaded {len(existing_data)} existing entries[/green]")
 
         # Scan Drive
         console.print("[cyan]Scanning Google Drive...[/cyan]")
+        files = scanner.iter_drive(folder_id=folder_id)
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=console,
         ) as progress:
             task = progress.add_task("Scanning files...", total=None)
-            files = scanner.scan_drive(folder_id=folder_id)
+            if update:
+                # Only the scan is held in memory; the existing catalog is merged while writing
+                scanned: dict[str, dict[str, Any]] = {}
+                found = 0
+                for file in files:
+                    scanned[file["id"]] = file
+                    found += 1
+            else:
+                # Write rows as folders are listed instead of holding the whole scan
+                found = _write_catalog(output, files, buffer_size=csv_buffer_bytes)
             progress.update(task, completed=True)
 
-        console.print(f"[green]Found {len(files)} files[/green]")
+        console.print(f"[green]Found {found} files[/green]")
 
-        # Merge with existing data if updating
+        total = found
         if update:
-            # Update existing entries and add new ones
-            for file in files:
-                file_id = file["id"]
-                existing_data[file_id] = file
-            files = list(existing_data.values())
-            console.print(f"[green]Merged catalog contains {len(files)} total entries[/green]")
-
-        # Write to CSV
-        console.print(f"[cyan]Writing catalog to {output}...[/cyan]")
-        output.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(output, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=CATALOG_FIELDNAMES)
-            writer.writeheader()
-            writer.writerows(files)
+            console.print(f"[cyan]Writing catalog to {output}...[/cyan]")
+            rows = _merge_catalog(output, scanned) if merge_existing else scanned.values()
+            total = _write_catalog(output, rows, buffer_size=csv_buffer_bytes)
+            console.print(f"[green]Merged catalog contains {total} total entries[/green]")
 
         console.print(f"[green]✓ Catalog saved to {output}[/green]")
-        console.print(f"[green]Total files cataloged: {len(files)}[/green]")
+        console.print(f"[green]Total files cataloged: {total}[/green]")
 
     except KeyboardInterrupt:
         console.print("\n[yellow]Scan interrupted by user[/yellow]")
@@ -158,6 +180,107 @@ def scan(
         raise typer.Exit(1) from e
 
 
+def _catalog_row(row: dict[str, Any]) -> tuple[Any, ...]:
+    """
+    Project a catalog entry onto the CATALOG_FIELDNAMES column order.
+
+    Scanner rows carry every column and go through a C-level itemgetter.
+    Rows loaded from an existing catalog may lack columns, which are
+    written empty; columns outside the schema are dropped.
+
+    Args:
+        row: Catalog entry keyed by column name
+
+    Returns:
+        Column values in CATALOG_FIELDNAMES order
+    """
+    try:
+        return _project_catalog_row(row)
+    except KeyError:
+        return tuple(row.get(name, "") for name in CATALOG_FIELDNAMES)
+
+
+def _merge_catalog(
+    existing: str | os.PathLike[str],
+    scanned: dict[str, dict[str, Any]],
+) -> Iterator[dict[str, Any]]:
+    """
+    Stream an existing catalog with freshly scanned entries merged in.
+
+    Scanned entries replace existing rows with the same ID in place, and
+    the remaining ones are appended in scan order. As with load_catalog_csv,
+    an ID repeated in the existing catalog keeps the position of its first
+    row and the values of its last. Existing rows are read one at a time,
+    so only their IDs and the repeated rows are kept in memory alongside
+    the scan.
+
+    Args:
+        existing: Path to the existing catalog CSV file
+        scanned: Scanned catalog entries keyed by file ID; consumed by the merge
+
+    Yields:
+        Merged catalog entries
+    """
+    # A first pass finds the last row of every repeated ID
+    seen: set[str] = set()
+    repeated: dict[str, dict[str, Any]] = {}
+    for row in iter_catalog_csv(existing):
+        file_id = row["id"]
+        if file_id in seen:
+            repeated[file_id] = row
+        else:
+            seen.add(file_id)
+
+    seen.clear()
+    for row in iter_catalog_csv(existing):
+        file_id = row["id"]
+        if file_id in seen:
+            continue
+        seen.add(file_id)
+        yield scanned.pop(file_id, repeated.get(file_id, row))
+    yield from scanned.values()
+
+
+def _write_catalog(
+    output: str | os.PathLike[str],
+    rows: Iterable[dict[str, Any]],
+    buffer_size: int = DEFAULT_CSV_BUFFER_BYTES,
+) -> int:
+    """
+    Write catalog rows to a CSV file.
+
+    Rows are consumed lazily and written to a temporary file that replaces
+    ``output`` only once every row has been written, so a failed scan never
+    leaves a truncated catalog behind.
+
+    Args:
+        output: Destination CSV file path
+        rows: Catalog rows to write
+        buffer_size: Write buffer size in bytes
+
+    Returns:
+        Number of rows written
+    """
+    output = os.fspath(output)
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    tmp_output = f"{output}.tmp"
+
+    count = 0
+    try:
+        with open(tmp_output, "w", newline="", encoding="utf-8", buffering=buffer_size) as f:
+            writer = csv.writer(f)
+            writer.writerow(CATALOG_FIELDNAMES)
+            for batch in batched(map(_catalog_row, rows), WRITE_BATCH_ROWS):
+                writer.writerows(batch)
+                count += len(batch)
+        os.replace(tmp_output, output)
+    finally:
+        if os.path.exists(tmp_output):
+            os.remove(tmp_output)
+
+    return count
+
+
 @app.command()
 def version():
     """Show version information."""
@@ -22,7 +22,8 @@ and provides validation functions that can be used throughout the application.
 """
 
 import csv
-from pathlib import Path
+import os
+from collections.abc import Collection, Iterator
 from typing import Any
 
 from gdrive_catalog.exceptions import CSVValidationError
@@ -31,6 +32,9 @@ from gdrive_catalog.exceptions import CSVValidationError
 # This defines the columns that must be present in a valid catalog CSV
 CATALOG_REQUIRED_COLUMNS = frozenset({"id"})
 
+# Read buffer for catalog files; large buffers keep read syscalls rare
+CSV_READ_BUFFER_BYTES = 1 << 20
+
 # All columns that are expected in a standard catalog CSV file
 # Used for writing CSV files and for validation reference
 CATALOG_FIELDNAMES = (
@@ -46,7 +50,7 @@ CATALOG_FIELDNAMES = (
 
 
 def validate_csv_headers(
-    headers: list[str] | None,
+    headers: Collection[str] | None,
     required_columns: frozenset[str] = CATALOG_REQUIRED_COLUMNS,
     file_path: str | None = None,
 ) -> None:
@@ -58,7 +62,7 @@ def validate_csv_headers(
     with detailed information if validation fails.
 
     Args:
-        headers: List of column names from the CSV file.
+        headers: Column names from the CSV file.
         required_columns: Set of column names that must be present.
         file_path: Optional path to the CSV file (for error messages).
 
@@ -77,25 +81,79 @@ def validate_csv_headers(
             actual_columns=set(),
         )
 
-    actual_columns = set(headers)
-    missing_columns = required_columns - actual_columns
+    # A single difference against the headers as given; the set of actual
+    # columns is only built when there is an error to report
+    missing_columns = required_columns.difference(headers)
 
     if missing_columns:
         raise CSVValidationError(
             "CSV file is missing required columns",
             file_path=file_path,
             missing_columns=missing_columns,
-            actual_columns=actual_columns,
+            actual_columns=set(headers),
         )
 
 
-def load_catalog_csv(file_path: Path | str) -> dict[str, dict[str, Any]]:
+def validate_catalog_csv(file_path: str | os.PathLike[str]) -> None:
+    """
+    Validate a catalog CSV file's headers without reading its rows.
+
+    Args:
+        file_path: Path to the CSV file to check.
+
+    Raises:
+        CSVValidationError: If the CSV file is empty or missing required columns.
+        FileNotFoundError: If the file doesn't exist.
+        UnicodeDecodeError: If the header contains invalid UTF-8 content.
+    """
+    file_path = os.fspath(file_path)
+
+    with open(file_path, newline="", encoding="utf-8") as f:
+        validate_csv_headers(next(csv.reader(f), None), file_path=file_path)
+
+
+def iter_catalog_csv(file_path: str | os.PathLike[str]) -> Iterator[dict[str, Any]]:
+    """
+    Validate a catalog CSV file and yield its rows one at a time.
+
+    Rows without an 'id' are skipped. The file is read lazily, so the
+    headers are only validated once iteration starts.
+
+    Args:
+        file_path: Path to the CSV file to read.
+
+    Yields:
+        Row data keyed by column name.
+
+    Raises:
+        CSVValidationError: If the CSV file is invalid or missing required columns.
+        FileNotFoundError: If the file doesn't exist.
+        UnicodeDecodeError: If the file contains invalid UTF-8 content.
+    """
+    file_path = os.fspath(file_path)
+
+    with open(file_path, newline="", encoding="utf-8", buffering=CSV_READ_BUFFER_BYTES) as f:
+        reader = csv.reader(f)
+        headers = next(reader, None)
+
+        # Validate headers before processing rows
+        validate_csv_headers(headers, file_path=file_path)
+
+        # Build rows with C-level zip/dict instead of a DictReader per row;
+        # short rows simply leave their trailing columns out
+        id_index = headers.index("id")
+        for row in reader:
+            if len(row) > id_index and row[id_index]:
+                yield dict(zip(headers, row, strict=False))
+
+
+def load_catalog_csv(file_path: str | os.PathLike[str]) -> dict[str, dict[str, Any]]:
     """
     Load and validate a catalog CSV file, returning entries indexed by ID.
 
     This function reads a CSV file, validates it has the required schema,
     and returns its contents as a dictionary keyed by the 'id' column.
-    This is the recommended way to load existing catalog data.
+    Use iter_catalog_csv instead when the rows only need to be read once.
 
     Args:
         file_path: Path to the CSV file to load.
@@ -113,20 +171,4 @@ def load_catalog_csv(file_path: Path | str) -> dict[str, dict[str, Any]]:
         >>> print(data["file123"]["name"])
         "document.pdf"
     """
-    file_path = Path(file_path)
-    str_path = str(file_path)
-
-    with open(file_path, encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-
-        # Validate headers before processing rows
-        validate_csv_headers(reader.fieldnames, file_path=str_path)
-
-        # Process rows and build dictionary keyed by ID
-        data: dict[str, dict[str, Any]] = {}
-        for row in reader:
-            file_id = row.get("id")
-            if file_id:
-                data[file_id] = row
-
-        return data
+    return {row["id"]: row for row in iter_catalog_csv(file_path)}
@@ -16,20 +16,121 @@
 
 """Google Drive API service wrapper."""
 
-import pickle
+import logging
+import os
+import random
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http, set_user_agent
 
-from gdrive_catalog.exceptions import FileDownloadError, FileListError, FileMetadataError
+from gdrive_catalog import __version__
+from gdrive_catalog.exceptions import (
+    DriveServiceError,
+    FileDownloadError,
+    FileListError,
+    FileMetadataError,
+)
+from gdrive_catalog.rate_limiter import AdaptiveRateLimiter
 
-# If modifying these scopes, delete the token.pickle file.
+logger = logging.getLogger(__name__)
+
+# If modifying these scopes, delete the token.json file.
 SCOPES = ["https://www.googleapis.com/auth/drive.readonly"]
 
+# Partial-response mask for file listings. Media metadata is costly for the
+# server to serialize, so it is left out and fetched only for files that need it.
+LIST_FIELDS = "nextPageToken, files(id, name, mimeType, size, createdTime, parents, webViewLink)"
+
+# Partial-response mask for folder-only listings used to discover the tree
+FOLDER_FIELDS = "nextPageToken, files(id, name, parents)"
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+
+# Google Workspace types that have no file content to catalog. Leaving them
+# out of the query saves transferring listings the scanner would discard.
+WORKSPACE_MIME_TYPES = tuple(
+    f"application/vnd.google-apps.{kind}"
+    for kind in (
+        "document",
+        "drawing",
+        "form",
+        "jam",
+        "map",
+        "presentation",
+        "script",
+        "shortcut",
+        "site",
+        "spreadsheet",
+    )
+)
+
+# Fields returned by get_file_metadata unless the caller narrows them
+METADATA_FIELDS = "id, name, mimeType, size, createdTime, parents, webViewLink, videoMediaMetadata"
+
+# Prefixed to the client library's "(gzip)" user agent, which together with
+# its Accept-Encoding header makes Drive compress responses
+USER_AGENT = f"gdrive-catalog/{__version__}"
+
+# Largest page files.list accepts; fewer pages mean fewer round trips
+LIST_PAGE_SIZE = 1000
+
+# Maximum number of sub-requests Drive accepts in a single batch request
+MAX_BATCH_SIZE = 100
+
+# Retries for transient errors (429, 5xx and rate-limit 403s). The client
+# library backs off exponentially with jitter between attempts.
+NUM_RETRIES = 5
+
+# HTTP statuses of batch sub-requests worth retrying
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def _is_rate_limited(status: int, content: bytes | None) -> bool:
+    """Tell whether a response reports that a Drive rate limit was exceeded."""
+    if status == 429:
+        return True
+    # Rate limits are also reported as 403 userRateLimitExceeded/rateLimitExceeded
+    return status == 403 and b"ratelimitexceeded" in (content or b"").lower()
+
+
+def _is_transient(error: Exception) -> bool:
+    """Tell whether a failed sub-request is worth retrying."""
+    if not isinstance(error, HttpError):
+        return False
+    return error.resp.status in RETRY_STATUSES or _is_rate_limited(error.resp.status, error.content)
+
+
+@lru_cache(maxsize=1024)
+def _files_query(folder_id: str | None, exclude_folders: bool, exclude_workspace: bool) -> str:
+    """Build the files.list query for a folder's files, reused across its pages."""
+    query = "trashed=false"
+    if folder_id:
+        query = f"'{folder_id}' in parents and trashed=false"
+    if exclude_folders:
+        query = f"{query} and mimeType != '{FOLDER_MIME_TYPE}'"
+    if exclude_workspace:
+        query += "".join(f" and mimeType != '{mime_type}'" for mime_type in WORKSPACE_MIME_TYPES)
+    return query
+
+
+@lru_cache(maxsize=1024)
+def _folders_query(folder_id: str | None) -> str:
+    """Build the files.list query for a folder's subfolders, reused across its pages."""
+    query = f"mimeType = '{FOLDER_MIME_TYPE}' and trashed=false"
+    if folder_id:
+        query = f"'{folder_id}' in parents and {query}"
+    return query
+
 
 class DriveService:
     """Wrapper for Google Drive API service."""
@@ -42,7 +143,11 @@ class DriveService:
             credentials_path: Path to OAuth2 credentials JSON file
         """
         self.credentials_path = credentials_path
-        self.token_path = "token.pickle"
+        self.token_path = "token.json"
+        self.credentials = None
+        self._local = threading.local()
+        # Shared by every thread's transport so workers pace each other
+        self.rate_limiter = AdaptiveRateLimiter()
         self.service = self._authenticate()
 
     def _authenticate(self):
@@ -51,8 +156,7 @@ class DriveService:
 
         # Load token from file if it exists
         if Path(self.token_path).exists():
-            with open(self.token_path, "rb") as token:
-                creds = pickle.load(token)
+            creds = Credentials.from_authorized_user_file(self.token_path, SCOPES)
 
         # If no valid credentials, authenticate
         if not creds or not creds.valid:
@@ -63,16 +167,87 @@ class DriveService:
                 creds = flow.run_local_server(port=0)
 
             # Save credentials for next time
-            with open(self.token_path, "wb") as token:
-                pickle.dump(creds, token)
+            self._save_token(creds)
+
+        self.credentials = creds
+        # Use the discovery document bundled with the client library instead
+        # of fetching it over HTTPS on every start
+        return build("drive", "v3", credentials=creds, static_discovery=True)
+
+    def _save_token(self, creds: Credentials) -> None:
+        """
+        Save OAuth credentials as JSON.
+
+        The token is written to a temporary file first and then moved into
+        place, so an interrupted run never leaves a truncated token behind.
+        The file is only readable by its owner, since it holds a refresh token.
+
+        Args:
+            creds: Credentials to persist
+        """
+        tmp_path = f"{self.token_path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as token:
+            token.write(creds.to_json())
+        os.replace(tmp_path, self.token_path)
+
+    def _http(self) -> AuthorizedHttp | None:
+        """
+        Return an authorized HTTP transport owned by the calling thread.
+
+        httplib2 connections are not thread-safe, so every thread issuing
+        requests gets its own transport. All transports share the rate
+        limiter. Returns None when no credentials are available, which makes
+        requests fall back to the service's default.
+        """
+        if self.credentials is None:
+            return None
+
+        http = getattr(self._local, "http", None)
+        if http is None:
+            # build_http applies the client library's socket timeout and redirects
+            transport = set_user_agent(build_http(), USER_AGENT)
+            http = AuthorizedHttp(self.credentials, http=self._rate_limited(transport))
+            self._local.http = http
+        return http
+
+    def _rate_limited(self, http: Any) -> Any:
+        """
+        Route every request of an HTTP transport through the rate limiter.
+
+        Retries made by the client library go through the transport too, so
+        they are paced and reported to the limiter like first attempts.
+
+        Args:
+            http: httplib2-compatible transport
+
+        Returns:
+            The same transport, with its request method wrapped
+        """
+        request = http.request
+        limiter = self.rate_limiter
+
+        def limited_request(uri, *args, **kwargs):
+            limiter.acquire()
+            resp, content = request(uri, *args, **kwargs)
+            if _is_rate_limited(resp.status, content):
+                limiter.record_throttled()
+            elif resp.status < 400:
+                # Server errors neither slow the limiter down nor speed it up
+                limiter.record_success()
+            return resp, content
 
-        return build("drive", "v3", credentials=creds)
+        http.request = limited_request
+        return http
 
     def list_files(
         self,
         folder_id: str | None = None,
-        page_size: int = 1000,
+        page_size: int = LIST_PAGE_SIZE,
         page_token: str | None = None,
+        fields: str = LIST_FIELDS,
+        exclude_folders: bool = False,
+        exclude_workspace: bool = False,
     ) -> dict[str, Any]:
         """
         List files in Google Drive.
@@ -81,27 +256,59 @@ class DriveService:
             folder_id: Optional folder ID to list files from
             page_size: Number of files per page
             page_token: Token for pagination
+            fields: Partial-response mask; include ``videoMediaMetadata`` to
+                opt into media metadata for the listed files
+            exclude_folders: Leave folders out of the listing
+            exclude_workspace: Leave Google Workspace documents out of the listing
 
         Returns:
             Dictionary with 'files' and 'nextPageToken'
         """
-        try:
-            query = "trashed=false"
-            if folder_id:
-                query = f"'{folder_id}' in parents and trashed=false"
+        query = _files_query(folder_id, exclude_folders, exclude_workspace)
+        return self._list(query, folder_id, page_size, page_token, fields)
+
+    def list_folders(
+        self,
+        folder_id: str | None = None,
+        page_size: int = LIST_PAGE_SIZE,
+        page_token: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        List only the folders in Google Drive.
+
+        Folder listings use a narrow field mask and are usually a single page,
+        which makes them a cheap way to discover the folder tree.
 
+        Args:
+            folder_id: Optional folder ID to list subfolders of
+            page_size: Number of folders per page
+            page_token: Token for pagination
+
+        Returns:
+            Dictionary with 'files' and 'nextPageToken'
+        """
+        query = _folders_query(folder_id)
+        return self._list(query, folder_id, page_size, page_token, FOLDER_FIELDS)
+
+    def _list(
+        self,
+        query: str,
+        folder_id: str | None,
+        page_size: int,
+        page_token: str | None,
+        fields: str,
+    ) -> dict[str, Any]:
+        """Run a files.list request, wrapping API errors in FileListError."""
+        try:
             results = (
                 self.service.files()
                 .list(
                     q=query,
                     pageSize=page_size,
                     pageToken=page_token,
-                    fields=(
-                        "nextPageToken, files(id, name, mimeType, size, "
-                        "createdTime, parents, webViewLink, videoMediaMetadata)"
-                    ),
+                    fields=fields,
                 )
-                .execute()
+                .execute(http=self._http(), num_retries=NUM_RETRIES)
             )
 
             return results
@@ -112,12 +319,13 @@ class DriveService:
                 original_error=error,
             ) from error
 
-    def get_file_metadata(self, file_id: str) -> dict[str, Any]:
+    def get_file_metadata(self, file_id: str, fields: str = METADATA_FIELDS) -> dict[str, Any]:
         """
         Get detailed metadata for a specific file.
 
         Args:
             file_id: Google Drive file ID
+            fields: Partial-response mask for the returned metadata
 
         Returns:
             File metadata dictionary
@@ -125,14 +333,8 @@ class DriveService:
         try:
             file = (
                 self.service.files()
-                .get(
-                    fileId=file_id,
-                    fields=(
-                        "id, name, mimeType, size, createdTime, "
-                        "parents, webViewLink, videoMediaMetadata"
-                    ),
-                )
-                .execute()
+                .get(fileId=file_id, fields=fields)
+                .execute(http=self._http(), num_retries=NUM_RETRIES)
             )
             return file
         except HttpError as error:
@@ -142,6 +344,84 @@ class DriveService:
                 original_error=error,
             ) from error
 
+    def get_file_metadata_batch(
+        self, file_ids: list[str], fields: str = METADATA_FIELDS
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Get metadata for several files using batched HTTP requests.
+
+        Up to MAX_BATCH_SIZE lookups are packed into each HTTP round trip.
+        Lookups rejected with a transient error, such as a rate limit, are
+        retried in a new batch with exponential backoff. Every lookup takes a
+        token from the rate limiter, and throttled lookups slow it down. Files
+        whose metadata cannot be fetched are left out of the result.
+
+        Args:
+            file_ids: Google Drive file IDs
+            fields: Partial-response mask for the returned metadata
+
+        Returns:
+            Dictionary mapping file IDs to their metadata
+        """
+        results: dict[str, dict[str, Any]] = {}
+        retry_ids: list[str] = []
+        attempt = 0
+
+        def collect(request_id: str, response: dict[str, Any], exception: HttpError | None):
+            if exception is None:
+                results[request_id] = response
+                return
+
+            # The batch itself succeeds, so the transport never sees throttled lookups
+            if isinstance(exception, HttpError) and _is_rate_limited(
+                exception.resp.status, exception.content
+            ):
+                self.rate_limiter.record_throttled()
+
+            if not _is_transient(exception):
+                # Missing or inaccessible files are expected, but leave a trace
+                logger.debug("Failed to fetch metadata for file %s: %s", request_id, exception)
+            elif attempt < NUM_RETRIES:
+                retry_ids.append(request_id)
+            else:
+                logger.warning(
+                    "Failed to fetch metadata for file %s after %d retries: %s",
+                    request_id,
+                    NUM_RETRIES,
+                    exception,
+                )
+
+        pending_ids = list(dict.fromkeys(file_ids))
+        while pending_ids:
+            for start in range(0, len(pending_ids), MAX_BATCH_SIZE):
+                batch_ids = pending_ids[start : start + MAX_BATCH_SIZE]
+                batch = self.service.new_batch_http_request(callback=collect)
+                for file_id in batch_ids:
+                    batch.add(
+                        self.service.files().get(fileId=file_id, fields=fields),
+                        request_id=file_id,
+                    )
+
+                # Drive charges every lookup against the quota, while the
+                # transport only takes a token for the batch request itself
+                self.rate_limiter.acquire(len(batch_ids) - 1)
+                try:
+                    batch.execute(http=self._http())
+                except HttpError as error:
+                    raise DriveServiceError(
+                        message=str(error),
+                        operation=f"get metadata for {len(pending_ids)} files",
+                        original_error=error,
+                    ) from error
+
+            pending_ids, retry_ids = retry_ids, []
+            if pending_ids:
+                attempt += 1
+                # Same jittered exponential backoff as the client library
+                time.sleep(random.random() * 2**attempt)
+
+        return results
+
     def download_file(self, file_id: str) -> bytes:
         """
         Download file content.
@@ -154,7 +434,7 @@ class DriveService:
         """
         try:
             request = self.service.files().get_media(fileId=file_id)
-            return request.execute()
+            return request.execute(http=self._http(), num_retries=NUM_RETRIES)
         except HttpError as error:
             raise FileDownloadError(
                 message=str(error),
@@ -51,14 +51,17 @@ class DriveServiceError(Exception):
         self.operation = operation
         self.original_error = original_error
 
-        # Build a descriptive error message
-        full_message = message
-        if operation:
-            full_message = f"Failed to {operation}: {message}"
-        if original_error:
-            full_message = f"{full_message} (HTTP {original_error.resp.status})"
-
-        super().__init__(full_message)
+        # The descriptive message is built by __str__, only when it is shown
+        super().__init__(message)
+
+    def __str__(self) -> str:
+        """Return a descriptive message including the operation and HTTP status."""
+        full_message = self.message
+        if self.operation:
+            full_message = f"Failed to {self.operation}: {self.message}"
+        if self.original_error:
+            full_message = f"{full_message} (HTTP {self.original_error.resp.status})"
+        return full_message
 
     @property
     def status_code(self) -> int | None:
@@ -197,11 +200,14 @@ class CSVValidationError(Exception):
         self.missing_columns = missing_columns or set()
         self.actual_columns = actual_columns or set()
 
-        # Build a descriptive error message
-        full_message = message
-        if file_path:
-            full_message = f"Invalid CSV file '{file_path}': {message}"
-        if missing_columns:
-            full_message = f"{full_message}. Missing columns: {sorted(missing_columns)}"
-
-        super().__init__(full_message)
+        # The descriptive message is built by __str__, only when it is shown
+        super().__init__(message)
+
+    def __str__(self) -> str:
+        """Return a descriptive message including the file path and missing columns."""
+        full_message = self.message
+        if self.file_path:
+            full_message = f"Invalid CSV file '{self.file_path}': {self.message}"
+        if self.missing_columns:
+            full_message = f"{full_message}. Missing columns: {sorted(self.missing_columns)}"
+        return full_message
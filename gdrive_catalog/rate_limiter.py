@@ -0,0 +1,102 @@
+# gdrive-catalog - CLI tool to scan Google Drive storage and create CSV catalogs
+# Copyright (C) 2024 gdrive-catalog contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Client-side rate limiting for Google Drive API requests."""
+
+import threading
+import time
+from collections.abc import Callable
+
+# Requests per second allowed before Drive has pushed back, comfortably
+# below its default quota of 12,000 queries per minute per user
+DEFAULT_MAX_RATE = 50.0
+
+# Lowest rate the limiter falls back to under sustained throttling
+DEFAULT_MIN_RATE = 1.0
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket shared by worker threads, with a rate that adapts to throttling.
+
+    Every request takes a token first, so concurrent workers are spread out
+    instead of retrying in lockstep. When Drive reports a rate limit, the
+    rate is cut multiplicatively; each successful request raises it again
+    additively, up to ``max_rate``.
+    """
+
+    def __init__(
+        self,
+        max_rate: float = DEFAULT_MAX_RATE,
+        min_rate: float = DEFAULT_MIN_RATE,
+        decrease_factor: float = 0.7,
+        increase_step: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the limiter at its maximum rate with a full bucket.
+
+        Args:
+            max_rate: Highest number of requests per second
+            min_rate: Lowest number of requests per second
+            decrease_factor: Rate multiplier applied on each throttled request
+            increase_step: Requests per second added on each successful request
+            clock: Monotonic clock, in seconds
+            sleep: Function used to wait for a token
+        """
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step
+        self.rate = max_rate
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        # The bucket holds up to one second of requests at the current rate
+        self._tokens = max_rate
+        self._last_refill = clock()
+
+    def acquire(self, tokens: int = 1) -> None:
+        """
+        Take tokens, waiting until they are available.
+
+        Args:
+            tokens: Number of tokens to take, one per request charged to the quota
+        """
+        with self._lock:
+            now = self._clock()
+            elapsed = now - self._last_refill
+            self._last_refill = now
+            self._tokens = min(self.rate, self._tokens + elapsed * self.rate)
+
+            # Reserve the tokens now and wait outside the lock, so waiters queue up fairly
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            self._sleep(wait)
+
+    def record_throttled(self) -> None:
+        """Slow down after Drive rejected a request for exceeding a rate limit."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self._tokens = min(self._tokens, self.rate)
+
+    def record_success(self) -> None:
+        """Speed back up after a request that was not throttled."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase_step)
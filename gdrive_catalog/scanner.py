@@ -17,48 +17,79 @@
 """Scanner for Google Drive files with metadata extraction."""
 
 import logging
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any
 
 from gdrive_catalog.drive_service import DriveService
+from gdrive_catalog.exceptions import DriveServiceError
 
 logger = logging.getLogger(__name__)
 
+# MIME type prefix of Google Docs, Sheets, folders and other Workspace items
+GOOGLE_WORKSPACE_PREFIX = "application/vnd.google-apps."
+
+# Link used for files listed without a webViewLink
+DRIVE_FILE_URL = "https://drive.google.com/file/d/{}/view"
+
 
 class DriveScanner:
     """Scanner to catalog files from Google Drive."""
 
     # MIME types for audio and video files
-    AUDIO_MIME_TYPES = {
-        "audio/mpeg",
-        "audio/mp3",
-        "audio/mp4",
-        "audio/wav",
-        "audio/flac",
-        "audio/ogg",
-        "audio/aac",
-        "audio/x-m4a",
-        "audio/webm",
-    }
-
-    VIDEO_MIME_TYPES = {
-        "video/mp4",
-        "video/mpeg",
-        "video/quicktime",
-        "video/x-msvideo",
-        "video/x-matroska",
-        "video/webm",
-        "video/3gpp",
-    }
-
-    def __init__(self, drive_service: DriveService):
+    AUDIO_MIME_TYPES = frozenset(
+        {
+            "audio/mpeg",
+            "audio/mp3",
+            "audio/mp4",
+            "audio/wav",
+            "audio/flac",
+            "audio/ogg",
+            "audio/aac",
+            "audio/x-m4a",
+            "audio/webm",
+        }
+    )
+
+    VIDEO_MIME_TYPES = frozenset(
+        {
+            "video/mp4",
+            "video/mpeg",
+            "video/quicktime",
+            "video/x-msvideo",
+            "video/x-matroska",
+            "video/webm",
+            "video/3gpp",
+        }
+    )
+
+    # Files that may carry a duration, checked with a single lookup. Drive only
+    # reports durations for video, so audio files keep an empty duration.
+    MEDIA_MIME_TYPES = AUDIO_MIME_TYPES | VIDEO_MIME_TYPES
+
+    # Fields fetched on demand for media files, since listings omit them.
+    # Only the duration is read from the media metadata (see _extract_duration).
+    MEDIA_METADATA_FIELDS = "id, videoMediaMetadata/durationMillis"
+
+    # Fields needed to place an ancestor folder in a file's path
+    FOLDER_METADATA_FIELDS = "id, name, parents"
+
+    # Number of concurrent listings per worker pool while scanning
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(self, drive_service: DriveService, max_workers: int = DEFAULT_MAX_WORKERS):
         """
         Initialize scanner with Drive service.
 
         Args:
             drive_service: Initialized DriveService instance
+            max_workers: Maximum number of concurrent listings per worker pool
         """
         self.drive_service = drive_service
+        self.max_workers = max_workers
         self.folder_cache: dict[str, dict[str, Any]] = {}
+        self.folder_paths: dict[str, str] = {}
 
     def scan_drive(self, folder_id: str | None = None) -> list[dict[str, Any]]:
         """
@@ -70,54 +101,246 @@ class DriveScanner:
         Returns:
             List of dictionaries containing file metadata
         """
-        all_files = []
-        folders_to_scan = [folder_id] if folder_id else [None]
-        scanned_folders = set()
-
-        while folders_to_scan:
-            current_folder = folders_to_scan.pop(0)
+        return list(self.iter_drive(folder_id=folder_id))
 
-            # Avoid scanning the same folder twice
-            if current_folder in scanned_folders:
-                continue
-            scanned_folders.add(current_folder)
+    def iter_drive(self, folder_id: str | None = None) -> Iterator[dict[str, Any]]:
+        """
+        Recursively scan Google Drive, yielding file metadata as it is listed.
 
-            # Get files in current folder
-            page_token = None
-            while True:
-                results = self.drive_service.list_files(
-                    folder_id=current_folder, page_token=page_token
-                )
+        The folder tree is discovered breadth-first with folder-only queries,
+        which are small and usually a single page. Every discovered folder's
+        files are listed in a separate worker pool, so discovering subfolders
+        never waits for a large folder to page through all of its files.
+        Files are yielded in discovery order as soon as their folder has been
+        listed, which lets callers stream them to disk. At most twice
+        ``max_workers`` folder listings are held at once, so memory stays
+        bounded on large trees.
 
-                for file in results.get("files", []):
-                    mime_type = file.get("mimeType", "")
+        Args:
+            folder_id: Optional folder ID to start scanning from
 
-                    # If it's a folder, add to scanning queue and cache its metadata
-                    if mime_type == "application/vnd.google-apps.folder":
-                        child_folder_id = file.get("id")
+        Yields:
+            Dictionaries containing file metadata
+        """
+        folders_to_scan = [folder_id] if folder_id else [None]
+        scanned_folders = set()
+        pending_listings: deque[Future[list[dict[str, Any]]]] = deque()
+        max_pending = 2 * self.max_workers
+
+        discovery_pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        listing_pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            while folders_to_scan:
+                # Avoid scanning the same folder twice
+                current_level = []
+                for current_folder in folders_to_scan:
+                    if current_folder not in scanned_folders:
+                        scanned_folders.add(current_folder)
+                        current_level.append(current_folder)
+                folders_to_scan = []
+
+                # Discover the next level while this level's files are listed
+                subfolder_listings = discovery_pool.map(self._list_subfolders, current_level)
+                for current_folder in current_level:
+                    # Keep listings from running too far ahead of the consumer
+                    while len(pending_listings) >= max_pending:
+                        yield from self._catalog_files(pending_listings.popleft().result())
+                    pending_listings.append(listing_pool.submit(self._list_folder, current_folder))
+
+                for subfolders in subfolder_listings:
+                    for folder in subfolders:
+                        child_folder_id = folder.get("id")
                         if child_folder_id:
                             folders_to_scan.append(child_folder_id)
-                            # Pre-populate folder cache to avoid N+1 API calls when building paths
-                            folder_parents = file.get("parents", [])
+                            # Pre-populate folder cache to avoid N+1 API calls
+                            # when building paths
+                            folder_parents = folder.get("parents", [])
                             self.folder_cache[child_folder_id] = {
-                                "name": file.get("name", ""),
+                                "name": folder.get("name", ""),
                                 "parent": folder_parents[0] if folder_parents else None,
                             }
-                        continue
 
-                    # Skip Google Workspace files (Docs, Sheets, etc.)
-                    if mime_type.startswith("application/vnd.google-apps."):
-                        continue
+                # Hand out finished listings without stalling discovery
+                while pending_listings and pending_listings[0].done():
+                    yield from self._catalog_files(pending_listings.popleft().result())
 
-                    # Process regular files
-                    file_data = self._extract_file_data(file)
-                    all_files.append(file_data)
+            while pending_listings:
+                yield from self._catalog_files(pending_listings.popleft().result())
+        finally:
+            # Drop queued listings if the caller stops consuming early
+            discovery_pool.shutdown(cancel_futures=True)
+            listing_pool.shutdown(cancel_futures=True)
 
-                page_token = results.get("nextPageToken")
-                if not page_token:
-                    break
+    def _catalog_files(self, files: list[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        """
+        Turn listed files into catalog entries.
+
+        Args:
+            files: Files from a folder listing
+
+        Yields:
+            Dictionaries containing file metadata
+        """
+        self._resolve_ancestors(files)
+
+        extract_file_data = self._extract_file_data
+        for file in files:
+            # Skip Google Workspace files the listing query does not already filter out
+            if file.get("mimeType", "").startswith(GOOGLE_WORKSPACE_PREFIX):
+                continue
+
+            yield extract_file_data(file)
+
+    def _resolve_ancestors(self, files: list[dict[str, Any]]) -> None:
+        """
+        Cache the ancestor folders of a folder listing that are still unknown.
+
+        Folder discovery caches every folder below the scan root, so only the
+        ancestors above it are usually missing. They are fetched with one
+        batched request per tree level for the whole listing, instead of one
+        request per folder while building each path.
+
+        Args:
+            files: Files from a folder listing
+        """
+        pending = {parents[0] for file in files if (parents := file.get("parents"))}
+        attempted: set[str] = set()
+
+        while pending:
+            missing = {
+                folder_id
+                for folder_id in map(self._first_uncached_ancestor, pending)
+                if folder_id and folder_id not in attempted
+            }
+            if not missing:
+                return
+            attempted |= missing
+
+            try:
+                folders = self.drive_service.get_file_metadata_batch(
+                    list(missing), fields=self.FOLDER_METADATA_FIELDS
+                )
+            except DriveServiceError as e:
+                # _build_file_path falls back to fetching folders one by one
+                logger.debug("Failed to fetch %d ancestor folders: %s", len(missing), e)
+                return
+
+            for folder_id, folder in folders.items():
+                folder_parents = folder.get("parents", [])
+                self.folder_cache[folder_id] = {
+                    "name": folder.get("name", ""),
+                    "parent": folder_parents[0] if folder_parents else None,
+                }
+            pending = missing
+
+    def _first_uncached_ancestor(self, folder_id: str | None) -> str | None:
+        """
+        Walk up the cached folder hierarchy to the first folder not in the cache.
 
-        return all_files
+        Args:
+            folder_id: Folder to start from
+
+        Returns:
+            The first uncached folder ID, or None if the chain ends or loops
+        """
+        visited = set()
+        while folder_id in self.folder_cache:
+            if folder_id in visited:
+                return None
+            visited.add(folder_id)
+            folder_id = self.folder_cache[folder_id].get("parent")
+        return folder_id
+
+    def _list_subfolders(self, folder_id: str | None) -> list[dict[str, Any]]:
+        """
+        Fetch every page of a folder-only listing.
+
+        Runs in a worker thread, so it only performs API calls and leaves all
+        scanner state to the caller.
+
+        Args:
+            folder_id: Folder ID to list subfolders of, or None for the whole Drive
+
+        Returns:
+            Listed folders
+        """
+        folders = []
+        page_token = None
+        while True:
+            results = self.drive_service.list_folders(folder_id=folder_id, page_token=page_token)
+            folders.extend(results.get("files", []))
+
+            page_token = results.get("nextPageToken")
+            if not page_token:
+                return folders
+
+    def _list_folder(self, folder_id: str | None) -> list[dict[str, Any]]:
+        """
+        Fetch every page of a folder's file listing, excluding subfolders.
+
+        Runs in a worker thread, so it only performs API calls and leaves all
+        scanner state to the caller.
+
+        Args:
+            folder_id: Folder ID to list, or None for the whole Drive
+
+        Returns:
+            Listed files, with media metadata merged into video files
+        """
+        files = []
+        page_token = None
+        while True:
+            results = self.drive_service.list_files(
+                folder_id=folder_id,
+                page_token=page_token,
+                exclude_folders=True,
+                exclude_workspace=True,
+            )
+
+            # Fetch media metadata left out of the listing, only where it matters
+            files.extend(self._fetch_media_metadata(results.get("files", [])))
+
+            page_token = results.get("nextPageToken")
+            if not page_token:
+                return files
+
+    def _fetch_media_metadata(self, files: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Merge media metadata into the video files of a listing page.
+
+        Drive only exposes durations through ``videoMediaMetadata``, which the
+        lean listing does not request. The missing metadata for a whole page
+        is fetched with a single batched request.
+
+        Args:
+            files: Files from one Drive listing page
+
+        Returns:
+            The files, with ``videoMediaMetadata`` merged in where available
+        """
+        pending_ids = [
+            file["id"]
+            for file in files
+            if file.get("mimeType") in self.VIDEO_MIME_TYPES
+            and file.get("id")
+            and "videoMediaMetadata" not in file
+        ]
+        if not pending_ids:
+            return files
+
+        try:
+            metadata = self.drive_service.get_file_metadata_batch(
+                pending_ids, fields=self.MEDIA_METADATA_FIELDS
+            )
+        except DriveServiceError as e:
+            # Duration is optional, so keep the files without it
+            logger.debug("Failed to fetch media metadata for %d files: %s", len(pending_ids), e)
+            return files
+
+        return [
+            {**file, **metadata[file["id"]]} if file.get("id") in metadata else file
+            for file in files
+        ]
 
     def _extract_file_data(self, file: dict[str, Any]) -> dict[str, Any]:
         """
@@ -129,23 +352,26 @@ class DriveScanner:
         Returns:
             Dictionary with extracted and formatted metadata
         """
-        file_id = file.get("id", "")
-        mime_type = file.get("mimeType", "")
+        # Runs once per cataloged file, so the lookup method is bound once
+        get = file.get
+        file_id = get("id", "")
+        mime_type = get("mimeType", "")
 
         # Get basic metadata
         data = {
             "id": file_id,
-            "name": file.get("name", ""),
-            "size_bytes": file.get("size", "0"),
+            "name": get("name", ""),
+            "size_bytes": get("size", "0"),
             "duration_milliseconds": "",
             "path": self._build_file_path(file),
-            "link": file.get("webViewLink", f"https://drive.google.com/file/d/{file_id}/view"),
-            "created_at": file.get("createdTime", ""),
+            # Only build the fallback link when Drive did not return one
+            "link": get("webViewLink") or DRIVE_FILE_URL.format(file_id),
+            "created_at": get("createdTime", ""),
             "mime_type": mime_type,
         }
 
         # Try to extract duration for audio/video files
-        if mime_type in self.AUDIO_MIME_TYPES or mime_type in self.VIDEO_MIME_TYPES:
+        if mime_type in self.MEDIA_MIME_TYPES:
             duration = self._extract_duration(file)
             if duration:
                 data["duration_milliseconds"] = str(duration)
@@ -183,19 +409,42 @@ class DriveScanner:
         if not parents:
             return f"/{file.get('name', '')}"
 
-        path_parts = [file.get("name", "")]
-        current_parent = parents[0]
+        return f"{self._folder_path(parents[0])}/{file.get('name', '')}"
+
+    def _folder_path(self, folder_id: str) -> str:
+        """
+        Build the path of a folder, memoizing it for the files it contains.
+
+        Only the ancestors without a memoized path are walked, so every file
+        after the first in a folder gets its path from a single lookup. Paths
+        that could not be fully resolved are not memoized.
 
-        # Traverse up the folder hierarchy
+        Args:
+            folder_id: Google Drive folder ID
+
+        Returns:
+            Folder path without a trailing slash, or "" for the Drive root
+        """
+        path = self.folder_paths.get(folder_id)
+        if path is not None:
+            return path
+
+        # Walk up the folder hierarchy until a folder with a known path
+        chain: list[tuple[str, str]] = []
+        current_parent: str | None = folder_id
+        path = ""
+        complete = True
         max_depth = 100  # Prevent infinite loops
-        depth = 0
         visited_folders = set()
 
-        while current_parent and depth < max_depth:
-            depth += 1
+        while current_parent:
+            if current_parent in self.folder_paths:
+                path = self.folder_paths[current_parent]
+                break
 
-            # Detect circular references
-            if current_parent in visited_folders:
+            # Detect circular references and overly deep hierarchies
+            if current_parent in visited_folders or len(chain) >= max_depth:
+                complete = False
                 break
             visited_folders.add(current_parent)
 
@@ -203,36 +452,39 @@ class DriveScanner:
             if current_parent in self.folder_cache:
                 folder_data = self.folder_cache[current_parent]
                 folder_name = folder_data["name"]
-                current_parent = folder_data.get("parent")
+                parent_id = folder_data.get("parent")
             else:
                 # Fetch folder metadata
                 try:
-                    folder = (
-                        self.drive_service.service.files()
-                        .get(fileId=current_parent, fields="name, parents")
-                        .execute()
+                    folder = self.drive_service.get_file_metadata(
+                        current_parent, fields=self.FOLDER_METADATA_FIELDS
                     )
-                    folder_name = folder.get("name", "")
-
-                    # Get parent's parent
-                    folder_parents = folder.get("parents", [])
-                    parent_id = folder_parents[0] if folder_parents else None
-
-                    # Cache both name and parent
-                    self.folder_cache[current_parent] = {
-                        "name": folder_name,
-                        "parent": parent_id,
-                    }
-
-                    current_parent = parent_id
                 except Exception as e:
                     # If we can't fetch parent, log and stop here
                     logger.debug("Failed to fetch parent folder %s: %s", current_parent, e)
+                    complete = False
                     break
 
+                folder_name = folder.get("name", "")
+
+                # Get parent's parent
+                folder_parents = folder.get("parents", [])
+                parent_id = folder_parents[0] if folder_parents else None
+
+                # Cache both name and parent
+                self.folder_cache[current_parent] = {
+                    "name": folder_name,
+                    "parent": parent_id,
+                }
+
+            chain.append((current_parent, folder_name))
+            current_parent = parent_id
+
+        # Build paths from the top down
+        for chain_folder_id, folder_name in reversed(chain):
             if folder_name:
-                path_parts.insert(0, folder_name)
+                path = f"{path}/{folder_name}"
+            if complete:
+                self.folder_paths[chain_folder_id] = path
 
-        # Build path
-        path = "/" + "/".join(path_parts)
         return path
@@ -0,0 +1,21 @@
+"""Shared fixtures for the test suite."""
+
+import csv
+from operator import itemgetter
+
+import pytest
+
+from gdrive_catalog.csv_validator import CATALOG_FIELDNAMES
+
+
+@pytest.fixture
+def write_catalog_file():
+    """Return a function that writes complete catalog rows to a CSV file."""
+
+    def write(path, rows):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(CATALOG_FIELDNAMES)
+            writer.writerows(map(itemgetter(*CATALOG_FIELDNAMES), rows))
+
+    return write
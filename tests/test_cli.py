@@ -1,14 +1,53 @@
 """Tests for the CLI module."""
 
 import csv
+import re
 from unittest.mock import MagicMock, patch
 
+import pytest
 from typer.testing import CliRunner
 
-from gdrive_catalog.cli import app
+from gdrive_catalog.cli import (
+    DEFAULT_CSV_BUFFER_BYTES,
+    WRITE_BATCH_ROWS,
+    _catalog_row,
+    _write_catalog,
+    app,
+)
+from gdrive_catalog.csv_validator import CATALOG_FIELDNAMES
 
 runner = CliRunner()
 
+# Matches the ANSI escape codes Rich adds to help output
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
+
+
+@pytest.fixture(scope="module")
+def help_results():
+    """Invoke each --help once, since the command tree never changes."""
+    return {
+        "app": runner.invoke(app, ["--help"]),
+        "scan": runner.invoke(app, ["scan", "--help"]),
+        "version": runner.invoke(app, ["version", "--help"]),
+    }
+
+
+@pytest.fixture(scope="module")
+def creds_file(tmp_path_factory):
+    """Write a placeholder credentials file shared by the scan tests."""
+    path = tmp_path_factory.mktemp("credentials") / "credentials.json"
+    path.write_text("{}")
+    return path
+
+
+@pytest.fixture
+def mock_scanner(monkeypatch):
+    """Replace the CLI's Drive service and scanner, returning the scanner mock."""
+    scanner = MagicMock()
+    monkeypatch.setattr("gdrive_catalog.cli.DriveService", MagicMock())
+    monkeypatch.setattr("gdrive_catalog.cli.DriveScanner", MagicMock(return_value=scanner))
+    return scanner
+
 
 class TestVersionCommand:
     """Tests for the version command."""
@@ -19,9 +58,9 @@ class TestVersionCommand:
         assert result.exit_code == 0
         assert "0.1.0" in result.stdout
 
-    def test_version_command_help(self):
+    def test_version_command_help(self, help_results):
         """Test that version command has help text."""
-        result = runner.invoke(app, ["version", "--help"])
+        result = help_results["version"]
         assert result.exit_code == 0
         assert "version" in result.stdout.lower()
 
@@ -36,33 +75,23 @@ class TestScanCommand:
         assert result.exit_code == 1
         assert "Credentials file not found" in result.stdout
 
-    def test_scan_help(self):
+    def test_scan_help(self, help_results):
         """Test scan command help is displayed."""
-        import re
-
-        result = runner.invoke(app, ["scan", "--help"])
+        result = help_results["scan"]
         assert result.exit_code == 0
-        # Strip ANSI escape codes for checking
-        ansi_escape = re.compile(r"\x1b\[[0-9;]*m")
-        clean_output = ansi_escape.sub("", result.stdout)
+        clean_output = ANSI_ESCAPE.sub("", result.stdout)
         assert "--folder-id" in clean_output
         assert "--output" in clean_output
         assert "--credentials" in clean_output
         assert "--update" in clean_output
+        assert "--csv-buffer-bytes" in clean_output
 
-    @patch("gdrive_catalog.cli.DriveScanner")
-    @patch("gdrive_catalog.cli.DriveService")
-    def test_scan_basic(self, mock_drive_service_class, mock_scanner_class, tmp_path):
+    def test_scan_basic(self, mock_scanner, creds_file, tmp_path):
         """Test basic scan command execution."""
-        # Create fake credentials file
-        creds_file = tmp_path / "credentials.json"
-        creds_file.write_text("{}")
-
         output_file = tmp_path / "catalog.csv"
 
         # Mock scanner to return some files
-        mock_scanner = MagicMock()
-        mock_scanner.scan_drive.return_value = [
+        mock_scanner.iter_drive.return_value = [
             {
                 "id": "file1",
                 "name": "test.pdf",
@@ -74,7 +103,6 @@ class TestScanCommand:
                 "mime_type": "application/pdf",
             }
         ]
-        mock_scanner_class.return_value = mock_scanner
 
         result = runner.invoke(
             app,
@@ -92,24 +120,16 @@ class TestScanCommand:
 
         # Verify CSV content
         with open(output_file) as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-            assert len(rows) == 1
-            assert rows[0]["id"] == "file1"
-            assert rows[0]["name"] == "test.pdf"
-
-    @patch("gdrive_catalog.cli.DriveScanner")
-    @patch("gdrive_catalog.cli.DriveService")
-    def test_scan_with_folder_id(self, mock_drive_service_class, mock_scanner_class, tmp_path):
-        """Test scan with specific folder ID."""
-        creds_file = tmp_path / "credentials.json"
-        creds_file.write_text("{}")
+            # Unpacking checks that exactly one row was written
+            (row,) = csv.DictReader(f)
+        assert row["id"] == "file1"
+        assert row["name"] == "test.pdf"
 
+    def test_scan_with_folder_id(self, mock_scanner, creds_file, tmp_path):
+        """Test scan with specific folder ID."""
         output_file = tmp_path / "catalog.csv"
 
-        mock_scanner = MagicMock()
-        mock_scanner.scan_drive.return_value = []
-        mock_scanner_class.return_value = mock_scanner
+        mock_scanner.iter_drive.return_value = []
 
         result = runner.invoke(
             app,
@@ -125,34 +145,18 @@ class TestScanCommand:
         )
 
         assert result.exit_code == 0
-        mock_scanner.scan_drive.assert_called_once_with(folder_id="test_folder_123")
+        mock_scanner.iter_drive.assert_called_once_with(folder_id="test_folder_123")
 
-    @patch("gdrive_catalog.cli.DriveScanner")
-    @patch("gdrive_catalog.cli.DriveService")
     def test_scan_update_existing_catalog(
-        self, mock_drive_service_class, mock_scanner_class, tmp_path
+        self, mock_scanner, creds_file, tmp_path, write_catalog_file
     ):
         """Test scan with update flag merges with existing catalog."""
-        creds_file = tmp_path / "credentials.json"
-        creds_file.write_text("{}")
-
         output_file = tmp_path / "catalog.csv"
 
         # Create existing catalog with one file
-        with open(output_file, "w", newline="") as f:
-            fieldnames = [
-                "id",
-                "name",
-                "size_bytes",
-                "duration_milliseconds",
-                "path",
-                "link",
-                "created_at",
-                "mime_type",
-            ]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerow(
+        write_catalog_file(
+            output_file,
+            [
                 {
                     "id": "existing_file",
                     "name": "old.pdf",
@@ -163,11 +167,11 @@ class TestScanCommand:
                     "created_at": "2024-01-01T00:00:00.000Z",
                     "mime_type": "application/pdf",
                 }
-            )
+            ],
+        )
 
         # Mock scanner to return a new file
-        mock_scanner = MagicMock()
-        mock_scanner.scan_drive.return_value = [
+        mock_scanner.iter_drive.return_value = [
             {
                 "id": "new_file",
                 "name": "new.pdf",
@@ -179,7 +183,6 @@ class TestScanCommand:
                 "mime_type": "application/pdf",
             }
         ]
-        mock_scanner_class.return_value = mock_scanner
 
         result = runner.invoke(
             app,
@@ -197,39 +200,21 @@ class TestScanCommand:
 
         # Verify merged catalog
         with open(output_file) as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-            ids = [r["id"] for r in rows]
-            # Should contain both existing and new files
-            assert "existing_file" in ids
-            assert "new_file" in ids
-
-    @patch("gdrive_catalog.cli.DriveScanner")
-    @patch("gdrive_catalog.cli.DriveService")
+            ids = {row["id"] for row in csv.DictReader(f)}
+        # Should contain both existing and new files
+        assert "existing_file" in ids
+        assert "new_file" in ids
+
     def test_scan_update_replaces_existing_entry(
-        self, mock_drive_service_class, mock_scanner_class, tmp_path
+        self, mock_scanner, creds_file, tmp_path, write_catalog_file
     ):
         """Test scan with update flag replaces existing entries."""
-        creds_file = tmp_path / "credentials.json"
-        creds_file.write_text("{}")
-
         output_file = tmp_path / "catalog.csv"
 
         # Create existing catalog
-        with open(output_file, "w", newline="") as f:
-            fieldnames = [
-                "id",
-                "name",
-                "size_bytes",
-                "duration_milliseconds",
-                "path",
-                "link",
-                "created_at",
-                "mime_type",
-            ]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerow(
+        write_catalog_file(
+            output_file,
+            [
                 {
                     "id": "file1",
                     "name": "old_name.pdf",
@@ -240,11 +225,11 @@ class TestScanCommand:
                     "created_at": "2024-01-01T00:00:00.000Z",
                     "mime_type": "application/pdf",
                 }
-            )
+            ],
+        )
 
         # Mock scanner returns same file with updated metadata
-        mock_scanner = MagicMock()
-        mock_scanner.scan_drive.return_value = [
+        mock_scanner.iter_drive.return_value = [
             {
                 "id": "file1",
                 "name": "new_name.pdf",
@@ -256,7 +241,6 @@ class TestScanCommand:
                 "mime_type": "application/pdf",
             }
         ]
-        mock_scanner_class.return_value = mock_scanner
 
         result = runner.invoke(
             app,
@@ -274,27 +258,70 @@ class TestScanCommand:
 
         # Verify the file was updated
         with open(output_file) as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-            assert len(rows) == 1
-            assert rows[0]["id"] == "file1"
-            assert rows[0]["name"] == "new_name.pdf"
-            assert rows[0]["size_bytes"] == "1024"
-
-    @patch("gdrive_catalog.cli.DriveScanner")
-    @patch("gdrive_catalog.cli.DriveService")
-    def test_scan_creates_output_directory(
-        self, mock_drive_service_class, mock_scanner_class, tmp_path
-    ):
-        """Test scan creates output directory if it doesn't exist."""
-        creds_file = tmp_path / "credentials.json"
-        creds_file.write_text("{}")
+            # Unpacking checks that the entry was replaced, not duplicated
+            (row,) = csv.DictReader(f)
+        assert row["id"] == "file1"
+        assert row["name"] == "new_name.pdf"
+        assert row["size_bytes"] == "1024"
+
+    def test_scan_update_merges_in_place(self, mock_scanner, creds_file, tmp_path):
+        """Test that updated entries keep their position and new ones are appended."""
+        output_file = tmp_path / "catalog.csv"
+        output_file.write_text("id,name\na,a.pdf\nb,b.pdf\nc,c.pdf\n")
 
+        mock_scanner.iter_drive.return_value = [
+            {"id": "d", "name": "d.pdf"},
+            {"id": "b", "name": "b_renamed.pdf"},
+        ]
+
+        result = runner.invoke(
+            app,
+            [
+                "scan",
+                "--credentials",
+                str(creds_file),
+                "--output",
+                str(output_file),
+                "--update",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "Found 2 files" in result.stdout
+        assert "Merged catalog contains 4 total entries" in result.stdout
+        with open(output_file) as f:
+            rows = [(row["id"], row["name"]) for row in csv.DictReader(f)]
+        assert rows == [("a", "a.pdf"), ("b", "b_renamed.pdf"), ("c", "c.pdf"), ("d", "d.pdf")]
+
+    def test_scan_update_collapses_duplicate_ids(self, mock_scanner, creds_file, tmp_path):
+        """Test that a repeated id keeps its first position and its last row."""
+        output_file = tmp_path / "catalog.csv"
+        output_file.write_text("id,name\na,a.pdf\nb,b.pdf\na,a_again.pdf\n")
+
+        mock_scanner.iter_drive.return_value = [{"id": "b", "name": "b_renamed.pdf"}]
+
+        result = runner.invoke(
+            app,
+            [
+                "scan",
+                "--credentials",
+                str(creds_file),
+                "--output",
+                str(output_file),
+                "--update",
+            ],
+        )
+
+        assert result.exit_code == 0
+        with open(output_file) as f:
+            rows = [(row["id"], row["name"]) for row in csv.DictReader(f)]
+        assert rows == [("a", "a_again.pdf"), ("b", "b_renamed.pdf")]
+
+    def test_scan_creates_output_directory(self, mock_scanner, creds_file, tmp_path):
+        """Test scan creates output directory if it doesn't exist."""
         output_file = tmp_path / "nested" / "dir" / "catalog.csv"
 
-        mock_scanner = MagicMock()
-        mock_scanner.scan_drive.return_value = []
-        mock_scanner_class.return_value = mock_scanner
+        mock_scanner.iter_drive.return_value = []
 
         result = runner.invoke(
             app,
@@ -311,16 +338,9 @@ class TestScanCommand:
         assert output_file.parent.exists()
         assert output_file.exists()
 
-    @patch("gdrive_catalog.cli.DriveScanner")
-    @patch("gdrive_catalog.cli.DriveService")
-    def test_scan_handles_exception(self, mock_drive_service_class, mock_scanner_class, tmp_path):
+    def test_scan_handles_exception(self, mock_scanner, creds_file):
         """Test scan handles exceptions gracefully."""
-        creds_file = tmp_path / "credentials.json"
-        creds_file.write_text("{}")
-
-        mock_scanner = MagicMock()
-        mock_scanner.scan_drive.side_effect = Exception("API Error")
-        mock_scanner_class.return_value = mock_scanner
+        mock_scanner.iter_drive.side_effect = Exception("API Error")
 
         result = runner.invoke(
             app,
@@ -334,17 +354,38 @@ class TestScanCommand:
         assert result.exit_code == 1
         assert "Error" in result.stdout
 
-    @patch("gdrive_catalog.cli.DriveScanner")
-    @patch("gdrive_catalog.cli.DriveService")
-    def test_scan_displays_file_count(self, mock_drive_service_class, mock_scanner_class, tmp_path):
-        """Test scan displays correct file counts."""
-        creds_file = tmp_path / "credentials.json"
-        creds_file.write_text("{}")
+    def test_scan_failure_keeps_existing_catalog(self, mock_scanner, creds_file, tmp_path):
+        """Test that a scan failing mid-stream leaves the previous catalog intact."""
+        output_file = tmp_path / "catalog.csv"
+        output_file.write_text("id\nold_file\n")
+
+        def failing_scan(folder_id):
+            yield {"id": "file1", "name": "test.pdf"}
+            raise Exception("API Error")
+
+        mock_scanner.iter_drive.side_effect = failing_scan
+
+        result = runner.invoke(
+            app,
+            [
+                "scan",
+                "--credentials",
+                str(creds_file),
+                "--output",
+                str(output_file),
+            ],
+        )
+
+        assert result.exit_code == 1
+        assert output_file.read_text() == "id\nold_file\n"
+        # The temporary file is cleaned up
+        assert list(tmp_path.iterdir()) == [output_file]
 
+    def test_scan_displays_file_count(self, mock_scanner, creds_file, tmp_path):
+        """Test scan displays correct file counts."""
         output_file = tmp_path / "catalog.csv"
 
-        mock_scanner = MagicMock()
-        mock_scanner.scan_drive.return_value = [
+        mock_scanner.iter_drive.return_value = [
             {
                 "id": f"file{i}",
                 "name": f"file{i}.pdf",
@@ -357,7 +398,6 @@ class TestScanCommand:
             }
             for i in range(5)
         ]
-        mock_scanner_class.return_value = mock_scanner
 
         result = runner.invoke(
             app,
@@ -374,6 +414,86 @@ class TestScanCommand:
         assert "5" in result.stdout
 
 
+class TestWriteCatalog:
+    """Tests for the _write_catalog helper."""
+
+    def test_write_catalog_returns_row_count(self, tmp_path):
+        """Test that rows are written and counted."""
+        output_file = tmp_path / "catalog.csv"
+
+        count = _write_catalog(output_file, iter([{"id": "file1"}, {"id": "file2"}]))
+
+        assert count == 2
+        with open(output_file) as f:
+            assert [row["id"] for row in csv.DictReader(f)] == ["file1", "file2"]
+
+    def test_write_catalog_counts_across_batches(self, tmp_path):
+        """Test that rows spanning several write batches are all written."""
+        output_file = tmp_path / "catalog.csv"
+        rows = ({"id": f"file{i}"} for i in range(WRITE_BATCH_ROWS + 1))
+
+        assert _write_catalog(output_file, rows) == WRITE_BATCH_ROWS + 1
+        assert len(output_file.read_text().splitlines()) == WRITE_BATCH_ROWS + 2
+
+    def test_write_catalog_accepts_str_path(self, tmp_path):
+        """Test that plain string paths work and leave no temporary file."""
+        output_file = tmp_path / "nested" / "catalog.csv"
+
+        assert _write_catalog(str(output_file), [{"id": "file1"}]) == 1
+        assert output_file.exists()
+        assert not (tmp_path / "nested" / "catalog.csv.tmp").exists()
+
+    def test_write_catalog_uses_default_buffer(self, tmp_path):
+        """Test that the output file is opened with the large default buffer."""
+        with patch("gdrive_catalog.cli.open", create=True, wraps=open) as mock_file:
+            _write_catalog(tmp_path / "catalog.csv", [])
+
+        assert mock_file.call_args.kwargs["buffering"] == DEFAULT_CSV_BUFFER_BYTES
+
+    def test_scan_custom_buffer_size(self, mock_scanner, creds_file, tmp_path):
+        """Test that --csv-buffer-bytes is used when writing the catalog."""
+        output_file = tmp_path / "catalog.csv"
+
+        mock_scanner.iter_drive.return_value = [{"id": "file1"}]
+
+        with patch("gdrive_catalog.cli.open", create=True, wraps=open) as mock_file:
+            result = runner.invoke(
+                app,
+                [
+                    "scan",
+                    "--credentials",
+                    str(creds_file),
+                    "--output",
+                    str(output_file),
+                    "--csv-buffer-bytes",
+                    "4096",
+                ],
+            )
+
+        assert result.exit_code == 0
+        assert mock_file.call_args.kwargs["buffering"] == 4096
+        assert "file1" in output_file.read_text()
+
+
+class TestCatalogRow:
+    """Tests for the _catalog_row projection."""
+
+    def test_catalog_row_complete_entry(self):
+        """Test that complete entries are projected in column order."""
+        row = {name: f"{name}_value" for name in reversed(CATALOG_FIELDNAMES)}
+        assert _catalog_row(row) == tuple(f"{name}_value" for name in CATALOG_FIELDNAMES)
+
+    def test_catalog_row_fills_missing_columns(self):
+        """Test that missing columns are written empty."""
+        values = _catalog_row({"id": "file1", "name": "test.pdf"})
+        assert values == ("file1", "test.pdf", "", "", "", "", "", "")
+
+    def test_catalog_row_drops_unknown_columns(self):
+        """Test that columns outside the schema are dropped."""
+        assert _catalog_row({"id": "file1", "extra": "x"})[0] == "file1"
+        assert "x" not in _catalog_row({"id": "file1", "extra": "x"})
+
+
 class TestAppConfiguration:
     """Tests for CLI app configuration."""
 
@@ -381,16 +501,16 @@ class TestAppConfiguration:
         """Test that the app has the correct name."""
         assert app.info.name == "gdrive-catalog"
 
-    def test_app_help_text(self):
+    def test_app_help_text(self, help_results):
         """Test that the app has help text."""
-        result = runner.invoke(app, ["--help"])
+        result = help_results["app"]
         assert result.exit_code == 0
         assert "Google Drive" in result.stdout
         assert "catalog" in result.stdout.lower()
 
-    def test_app_commands_available(self):
+    def test_app_commands_available(self, help_results):
         """Test that expected commands are available."""
-        result = runner.invoke(app, ["--help"])
+        result = help_results["app"]
         assert "scan" in result.stdout
         assert "version" in result.stdout
 
@@ -398,22 +518,28 @@ class TestAppConfiguration:
 class TestScanCSVValidation:
     """Tests for CSV validation in the scan command."""
 
-    @patch("gdrive_catalog.cli.DriveScanner")
-    @patch("gdrive_catalog.cli.DriveService")
-    def test_scan_update_rejects_csv_missing_id_column(
-        self, mock_drive_service_class, mock_scanner_class, tmp_path
+    @pytest.mark.parametrize(
+        ("csv_content", "expected"),
+        [
+            pytest.param(
+                "name,size_bytes,path\ntest.pdf,1024,/test.pdf\n",
+                ["error", "missing required columns", "id"],
+                id="missing-id-column",
+            ),
+            pytest.param("", ["error"], id="empty"),
+            pytest.param(
+                "name,size_bytes\ntest.pdf,1024\n",
+                ["invalid format", "options"],
+                id="helpful-message",
+            ),
+        ],
+    )
+    def test_scan_update_rejects_invalid_csv(
+        self, mock_scanner, creds_file, tmp_path, csv_content, expected
     ):
-        """Test scan with --update rejects CSV file missing 'id' column."""
-        creds_file = tmp_path / "credentials.json"
-        creds_file.write_text("{}")
-
+        """Test scan with --update rejects an invalid CSV with a helpful message."""
         output_file = tmp_path / "invalid.csv"
-
-        # Create invalid CSV without 'id' column
-        with open(output_file, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=["name", "size_bytes", "path"])
-            writer.writeheader()
-            writer.writerow({"name": "test.pdf", "size_bytes": "1024", "path": "/test.pdf"})
+        output_file.write_text(csv_content)
 
         result = runner.invoke(
             app,
@@ -428,53 +554,21 @@ class TestScanCSVValidation:
         )
 
         assert result.exit_code == 1
-        assert "Error" in result.stdout
-        assert "missing required columns" in result.stdout.lower()
-        assert "id" in result.stdout.lower()
+        output = result.stdout.lower()
+        for text in expected:
+            assert text in output
 
-    @patch("gdrive_catalog.cli.DriveScanner")
-    @patch("gdrive_catalog.cli.DriveService")
-    def test_scan_update_rejects_empty_csv(
-        self, mock_drive_service_class, mock_scanner_class, tmp_path
-    ):
-        """Test scan with --update rejects completely empty CSV file."""
-        creds_file = tmp_path / "credentials.json"
-        creds_file.write_text("{}")
-
-        output_file = tmp_path / "empty.csv"
-        output_file.write_text("")
-
-        result = runner.invoke(
-            app,
-            [
-                "scan",
-                "--credentials",
-                str(creds_file),
-                "--output",
-                str(output_file),
-                "--update",
-            ],
-        )
-
-        assert result.exit_code == 1
-        assert "Error" in result.stdout
-
-    @patch("gdrive_catalog.cli.DriveScanner")
-    @patch("gdrive_catalog.cli.DriveService")
-    def test_scan_update_shows_helpful_message_for_invalid_csv(
-        self, mock_drive_service_class, mock_scanner_class, tmp_path
-    ):
-        """Test that helpful guidance is shown when CSV validation fails."""
-        creds_file = tmp_path / "credentials.json"
-        creds_file.write_text("{}")
-
-        output_file = tmp_path / "invalid.csv"
+    def test_scan_update_accepts_valid_csv_with_only_id(self, mock_scanner, creds_file, tmp_path):
+        """Test scan with --update accepts CSV with at least 'id' column."""
+        output_file = tmp_path / "minimal.csv"
 
-        # Create invalid CSV
+        # Create valid CSV with only 'id' column
         with open(output_file, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=["name", "size_bytes"])
+            writer = csv.DictWriter(f, fieldnames=["id"])
             writer.writeheader()
-            writer.writerow({"name": "test.pdf", "size_bytes": "1024"})
+            writer.writerow({"id": "file1"})
+
+        mock_scanner.iter_drive.return_value = []
 
         result = runner.invoke(
             app,
@@ -488,31 +582,16 @@ class TestScanCSVValidation:
             ],
         )
 
-        assert result.exit_code == 1
-        # Should show helpful options to the user
-        assert "invalid format" in result.stdout.lower()
-        assert "options" in result.stdout.lower()
-
-    @patch("gdrive_catalog.cli.DriveScanner")
-    @patch("gdrive_catalog.cli.DriveService")
-    def test_scan_update_accepts_valid_csv_with_only_id(
-        self, mock_drive_service_class, mock_scanner_class, tmp_path
-    ):
-        """Test scan with --update accepts CSV with at least 'id' column."""
-        creds_file = tmp_path / "credentials.json"
-        creds_file.write_text("{}")
+        assert result.exit_code == 0
+        # The existing entry is carried over into the merged catalog
+        assert "Merged catalog contains 1 total entries" in result.stdout
 
-        output_file = tmp_path / "minimal.csv"
+    def test_scan_update_drops_unknown_columns(self, mock_scanner, creds_file, tmp_path):
+        """Test scan with --update rewrites catalogs that carry extra columns."""
+        output_file = tmp_path / "extra.csv"
+        output_file.write_text("id,name,notes\nfile1,test.pdf,keep me?\n")
 
-        # Create valid CSV with only 'id' column
-        with open(output_file, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=["id"])
-            writer.writeheader()
-            writer.writerow({"id": "file1"})
-
-        mock_scanner = MagicMock()
-        mock_scanner.scan_drive.return_value = []
-        mock_scanner_class.return_value = mock_scanner
+        mock_scanner.iter_drive.return_value = []
 
         result = runner.invoke(
             app,
@@ -527,5 +606,6 @@ class TestScanCSVValidation:
         )
 
         assert result.exit_code == 0
-        # Should show that existing entries were loaded
-        assert "1 existing entries" in result.stdout
+        with open(output_file) as f:
+            rows = list(csv.DictReader(f))
+        assert rows == [dict.fromkeys(CATALOG_FIELDNAMES, "") | {"id": "file1", "name": "test.pdf"}]
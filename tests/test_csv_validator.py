@@ -1,13 +1,17 @@
 """Tests for the CSV validator module."""
 
 import csv
+from unittest.mock import patch
 
 import pytest
 
 from gdrive_catalog.csv_validator import (
     CATALOG_FIELDNAMES,
     CATALOG_REQUIRED_COLUMNS,
+    CSV_READ_BUFFER_BYTES,
+    iter_catalog_csv,
     load_catalog_csv,
+    validate_catalog_csv,
     validate_csv_headers,
 )
 from gdrive_catalog.exceptions import CSVValidationError
@@ -116,18 +120,21 @@ class TestValidateCsvHeaders:
         assert "id" not in exc_info.value.missing_columns
         assert "name" not in exc_info.value.missing_columns
 
+    def test_custom_required_columns_present(self):
+        """Test that several custom required columns pass when all are present."""
+        validate_csv_headers(["name", "id", "custom"], required_columns=frozenset({"id", "custom"}))
+
 
 class TestLoadCatalogCsv:
     """Tests for the load_catalog_csv function."""
 
-    def test_load_valid_csv(self, tmp_path):
+    def test_load_valid_csv(self, tmp_path, write_catalog_file):
         """Test loading a valid catalog CSV file."""
         csv_file = tmp_path / "catalog.csv"
 
-        with open(csv_file, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=CATALOG_FIELDNAMES)
-            writer.writeheader()
-            writer.writerow(
+        write_catalog_file(
+            csv_file,
+            [
                 {
                     "id": "file1",
                     "name": "test.pdf",
@@ -138,7 +145,8 @@ class TestLoadCatalogCsv:
                     "created_at": "2024-01-15T10:00:00.000Z",
                     "mime_type": "application/pdf",
                 }
-            )
+            ],
+        )
 
         data = load_catalog_csv(csv_file)
 
@@ -147,26 +155,26 @@ class TestLoadCatalogCsv:
         assert data["file1"]["name"] == "test.pdf"
         assert data["file1"]["size_bytes"] == "1024"
 
-    def test_load_csv_with_multiple_rows(self, tmp_path):
+    def test_load_csv_with_multiple_rows(self, tmp_path, write_catalog_file):
         """Test loading a CSV with multiple entries."""
         csv_file = tmp_path / "catalog.csv"
 
-        with open(csv_file, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=CATALOG_FIELDNAMES)
-            writer.writeheader()
-            for i in range(3):
-                writer.writerow(
-                    {
-                        "id": f"file{i}",
-                        "name": f"file{i}.pdf",
-                        "size_bytes": str(1024 * (i + 1)),
-                        "duration_milliseconds": "",
-                        "path": f"/file{i}.pdf",
-                        "link": f"https://drive.google.com/file/d/file{i}/view",
-                        "created_at": "2024-01-15T10:00:00.000Z",
-                        "mime_type": "application/pdf",
-                    }
-                )
+        write_catalog_file(
+            csv_file,
+            (
+                {
+                    "id": f"file{i}",
+                    "name": f"file{i}.pdf",
+                    "size_bytes": str(1024 * (i + 1)),
+                    "duration_milliseconds": "",
+                    "path": f"/file{i}.pdf",
+                    "link": f"https://drive.google.com/file/d/file{i}/view",
+                    "created_at": "2024-01-15T10:00:00.000Z",
+                    "mime_type": "application/pdf",
+                }
+                for i in range(3)
+            ),
+        )
 
         data = load_catalog_csv(csv_file)
 
@@ -251,6 +259,40 @@ class TestLoadCatalogCsv:
         assert "file1" in data
         assert "file2" in data
 
+    def test_load_csv_skips_blank_and_short_rows(self, tmp_path):
+        """Test that blank lines and rows too short to hold an id are skipped."""
+        csv_file = tmp_path / "ragged.csv"
+        csv_file.write_text("name,id,size_bytes\n\nno_id.pdf\nshort.pdf,file1\n")
+
+        data = load_catalog_csv(csv_file)
+
+        assert data == {"file1": {"name": "short.pdf", "id": "file1"}}
+
+    def test_load_csv_repeated_id_keeps_last_row(self, tmp_path):
+        """Test that a repeated id keeps its first position and its last row."""
+        csv_file = tmp_path / "repeated.csv"
+        csv_file.write_text("id,name\na,a.pdf\nb,b.pdf\na,a_again.pdf\n")
+
+        data = load_catalog_csv(csv_file)
+
+        assert [(row["id"], row["name"]) for row in data.values()] == [
+            ("a", "a_again.pdf"),
+            ("b", "b.pdf"),
+        ]
+
+    def test_load_csv_with_quoted_newlines(self, tmp_path):
+        """Test that quoted fields spanning lines are read intact."""
+        csv_file = tmp_path / "multiline.csv"
+
+        with open(csv_file, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "name"])
+            writer.writerow(["file1", "line one\r\nline two"])
+
+        data = load_catalog_csv(csv_file)
+
+        assert data["file1"]["name"] == "line one\r\nline two"
+
     def test_load_csv_path_as_string(self, tmp_path):
         """Test that load_catalog_csv accepts string paths."""
         csv_file = tmp_path / "catalog.csv"
@@ -266,6 +308,69 @@ class TestLoadCatalogCsv:
         assert len(data) == 1
         assert "file1" in data
 
+    def test_load_csv_uses_large_read_buffer(self, tmp_path):
+        """Test that catalogs are read through the large buffer."""
+        csv_file = tmp_path / "catalog.csv"
+        csv_file.write_text("id\nfile1\n")
+
+        with patch("gdrive_catalog.csv_validator.open", create=True, wraps=open) as mock_file:
+            load_catalog_csv(csv_file)
+
+        assert mock_file.call_args.kwargs["buffering"] == CSV_READ_BUFFER_BYTES
+
+    def test_load_large_csv(self, tmp_path):
+        """Test that catalogs spanning many read buffers load completely."""
+        csv_file = tmp_path / "catalog.csv"
+        row_count = 10_000
+
+        with open(csv_file, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(CATALOG_FIELDNAMES)
+            for i in range(row_count):
+                writer.writerow([f"file{i}", f"name, {i}.pdf", "1024", "", "/a", "", "", ""])
+
+        data = load_catalog_csv(csv_file)
+
+        assert len(data) == row_count
+        assert data[f"file{row_count - 1}"]["name"] == f"name, {row_count - 1}.pdf"
+
+
+class TestIterCatalogCsv:
+    """Tests for the validate_catalog_csv and iter_catalog_csv functions."""
+
+    def test_validate_catalog_csv_accepts_valid_headers(self, tmp_path):
+        """Test that a catalog with an 'id' column passes validation."""
+        csv_file = tmp_path / "catalog.csv"
+        csv_file.write_text("id,name\nfile1,test.pdf\n")
+
+        validate_catalog_csv(csv_file)
+
+    def test_validate_catalog_csv_rejects_missing_id(self, tmp_path):
+        """Test that a catalog without an 'id' column fails validation."""
+        csv_file = tmp_path / "invalid.csv"
+        csv_file.write_text("name\ntest.pdf\n")
+
+        with pytest.raises(CSVValidationError) as exc_info:
+            validate_catalog_csv(csv_file)
+
+        assert "id" in exc_info.value.missing_columns
+
+    def test_iter_catalog_csv_yields_rows_in_order(self, tmp_path):
+        """Test that rows are yielded in file order, skipping rows without an id."""
+        csv_file = tmp_path / "catalog.csv"
+        csv_file.write_text("id,name\nb,b.pdf\n,none.pdf\na,a.pdf\n")
+
+        rows = list(iter_catalog_csv(csv_file))
+
+        assert rows == [{"id": "b", "name": "b.pdf"}, {"id": "a", "name": "a.pdf"}]
+
+    def test_iter_catalog_csv_reads_lazily(self, tmp_path):
+        """Test that the file is not opened until iteration starts."""
+        rows = iter_catalog_csv(tmp_path / "nonexistent.csv")
+
+        with pytest.raises(FileNotFoundError):
+            next(rows)
+
 
 class TestCSVValidationErrorAttributes:
     """Tests for CSVValidationError exception attributes."""
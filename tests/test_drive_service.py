@@ -1,11 +1,106 @@
 """Tests for the DriveService module."""
 
-from unittest.mock import MagicMock, mock_open, patch
-
+import json
+import logging
+import os
+import stat
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock, call, patch
+
+import httplib2
 import pytest
-
-from gdrive_catalog.drive_service import SCOPES, DriveService
-from gdrive_catalog.exceptions import FileDownloadError, FileListError, FileMetadataError
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from googleapiclient.http import DEFAULT_HTTP_TIMEOUT_SEC, HttpMock, HttpMockSequence
+
+from gdrive_catalog.drive_service import (
+    FOLDER_FIELDS,
+    LIST_FIELDS,
+    LIST_PAGE_SIZE,
+    MAX_BATCH_SIZE,
+    NUM_RETRIES,
+    SCOPES,
+    USER_AGENT,
+    WORKSPACE_MIME_TYPES,
+    DriveService,
+)
+from gdrive_catalog.exceptions import (
+    DriveServiceError,
+    FileDownloadError,
+    FileListError,
+    FileMetadataError,
+)
+from gdrive_catalog.rate_limiter import DEFAULT_MAX_RATE
+
+# Canned API responses; the service returns them as-is, so tests share them
+LIST_RESULT = {"files": [{"id": "file1", "name": "test.txt"}], "nextPageToken": None}
+METADATA_RESULT = {
+    "id": "file123",
+    "name": "document.pdf",
+    "mimeType": "application/pdf",
+    "size": "2048",
+}
+FILE_CONTENT = b"file content here"
+
+
+def _http_error(status, content):
+    """Build an HttpError with the given status and body."""
+    return HttpError(resp=httplib2.Response({"status": status}), content=content)
+
+
+RATE_LIMITED = ({"status": "429"}, b'{"error": {"code": 429, "message": "Rate Limit Exceeded"}}')
+
+
+def _serve_responses(drive_service, monkeypatch, responses):
+    """
+    Serve the service's API calls from canned HTTP responses.
+
+    The requests go through the real client library and rate-limited
+    transport, with the library's backoff sleeps recorded instead of waited.
+
+    Returns:
+        The list the backoff durations are appended to
+    """
+    http = HttpMockSequence(responses)
+    drive_service.service = build("drive", "v3", http=http, static_discovery=True)
+    drive_service.credentials = MagicMock()
+    drive_service._local.http = drive_service._rate_limited(http)
+    sleeps = []
+    monkeypatch.setattr("googleapiclient.http.time.sleep", sleeps.append)
+    return sleeps
+
+
+@pytest.fixture
+def auth_fakes(monkeypatch):
+    """Replace the Google auth and discovery entry points used by _authenticate."""
+    fakes = SimpleNamespace(
+        build=MagicMock(),
+        flow=MagicMock(),
+        credentials=MagicMock(),
+        path=MagicMock(),
+        request=MagicMock(),
+    )
+    monkeypatch.setattr("gdrive_catalog.drive_service.build", fakes.build)
+    monkeypatch.setattr("gdrive_catalog.drive_service.InstalledAppFlow", fakes.flow)
+    monkeypatch.setattr("gdrive_catalog.drive_service.Credentials", fakes.credentials)
+    monkeypatch.setattr("gdrive_catalog.drive_service.Path", fakes.path)
+    monkeypatch.setattr("gdrive_catalog.drive_service.Request", fakes.request)
+    return fakes
+
+
+@pytest.fixture
+def stub_authenticate(monkeypatch):
+    """Skip authentication, returning the Mock that stands in for _authenticate."""
+    authenticate = Mock(return_value=Mock())
+    monkeypatch.setattr(DriveService, "_authenticate", authenticate)
+    return authenticate
+
+
+@pytest.fixture
+def drive_service(stub_authenticate):
+    """Build a DriveService whose API resource is a Mock."""
+    return DriveService()
 
 
 class TestDriveServiceScopes:
@@ -19,262 +114,560 @@ class TestDriveServiceScopes:
 class TestDriveServiceInit:
     """Tests for DriveService initialization."""
 
-    @patch("gdrive_catalog.drive_service.DriveService._authenticate")
-    def test_init_sets_credentials_path(self, mock_auth):
+    def test_init_sets_credentials_path(self, stub_authenticate):
         """Test that initialization sets the credentials path."""
-        mock_auth.return_value = MagicMock()
         service = DriveService(credentials_path="/path/to/creds.json")
         assert service.credentials_path == "/path/to/creds.json"
 
-    @patch("gdrive_catalog.drive_service.DriveService._authenticate")
-    def test_init_default_credentials_path(self, mock_auth):
+    def test_init_default_credentials_path(self, drive_service):
         """Test that initialization uses default credentials path."""
-        mock_auth.return_value = MagicMock()
-        service = DriveService()
-        assert service.credentials_path == "credentials.json"
+        assert drive_service.credentials_path == "credentials.json"
 
-    @patch("gdrive_catalog.drive_service.DriveService._authenticate")
-    def test_init_sets_token_path(self, mock_auth):
+    def test_init_sets_token_path(self, drive_service):
         """Test that initialization sets the token path."""
-        mock_auth.return_value = MagicMock()
-        service = DriveService()
-        assert service.token_path == "token.pickle"
+        assert drive_service.token_path == "token.json"
 
-    @patch("gdrive_catalog.drive_service.DriveService._authenticate")
-    def test_init_calls_authenticate(self, mock_auth):
+    def test_init_calls_authenticate(self, stub_authenticate):
         """Test that initialization calls _authenticate."""
-        mock_auth.return_value = MagicMock()
-        DriveService()
-        mock_auth.assert_called_once()
+        service = DriveService()
+        stub_authenticate.assert_called_once()
+        assert service.service is stub_authenticate.return_value
 
 
 class TestDriveServiceAuthenticate:
     """Tests for the _authenticate method."""
 
-    @patch("gdrive_catalog.drive_service.build")
-    @patch("gdrive_catalog.drive_service.InstalledAppFlow")
-    @patch("gdrive_catalog.drive_service.pickle")
-    @patch("gdrive_catalog.drive_service.Path")
-    def test_authenticate_new_credentials(self, mock_path, mock_pickle, mock_flow, mock_build):
+    def test_authenticate_new_credentials(self, auth_fakes, tmp_path, monkeypatch):
         """Test authentication with no existing token."""
+        monkeypatch.chdir(tmp_path)
         # No existing token
-        mock_path.return_value.exists.return_value = False
+        auth_fakes.path.return_value.exists.return_value = False
 
         # Mock the OAuth flow
         mock_creds = MagicMock()
         mock_creds.valid = True
-        mock_flow.from_client_secrets_file.return_value.run_local_server.return_value = mock_creds
-
-        mock_build.return_value = MagicMock()
+        mock_creds.to_json.return_value = '{"token": "abc"}'
+        flow = auth_fakes.flow.from_client_secrets_file.return_value
+        flow.run_local_server.return_value = mock_creds
 
-        with patch("builtins.open", mock_open()):
-            service = DriveService(credentials_path="creds.json")
+        service = DriveService(credentials_path="creds.json")
 
-        mock_flow.from_client_secrets_file.assert_called_once()
-        mock_build.assert_called_once_with("drive", "v3", credentials=mock_creds)
+        auth_fakes.flow.from_client_secrets_file.assert_called_once()
+        auth_fakes.credentials.from_authorized_user_file.assert_not_called()
+        auth_fakes.build.assert_called_once_with(
+            "drive", "v3", credentials=mock_creds, static_discovery=True
+        )
         assert service.service is not None
-
-    @patch("gdrive_catalog.drive_service.build")
-    @patch("gdrive_catalog.drive_service.pickle")
-    @patch("gdrive_catalog.drive_service.Path")
-    def test_authenticate_with_valid_existing_token(self, mock_path, mock_pickle, mock_build):
+        assert service.credentials is mock_creds
+        # Token is saved as JSON without leaving the temporary file behind
+        assert (tmp_path / "token.json").read_text() == '{"token": "abc"}'
+        assert not (tmp_path / "token.json.tmp").exists()
+        if os.name == "posix":
+            assert stat.S_IMODE((tmp_path / "token.json").stat().st_mode) == 0o600
+
+    def test_authenticate_with_valid_existing_token(self, auth_fakes, tmp_path, monkeypatch):
         """Test authentication with valid existing token."""
+        monkeypatch.chdir(tmp_path)
         # Token exists
-        mock_path.return_value.exists.return_value = True
+        auth_fakes.path.return_value.exists.return_value = True
 
         # Mock valid credentials
         mock_creds = MagicMock()
         mock_creds.valid = True
-        mock_pickle.load.return_value = mock_creds
+        auth_fakes.credentials.from_authorized_user_file.return_value = mock_creds
 
-        mock_build.return_value = MagicMock()
+        service = DriveService(credentials_path="creds.json")
 
-        with patch("builtins.open", mock_open()):
-            service = DriveService(credentials_path="creds.json")
-
-        mock_build.assert_called_once_with("drive", "v3", credentials=mock_creds)
+        auth_fakes.credentials.from_authorized_user_file.assert_called_once_with(
+            "token.json", SCOPES
+        )
+        auth_fakes.build.assert_called_once_with(
+            "drive", "v3", credentials=mock_creds, static_discovery=True
+        )
         assert service.service is not None
+        # A valid token is not rewritten
+        assert list(tmp_path.iterdir()) == []
 
-    @patch("gdrive_catalog.drive_service.build")
-    @patch("gdrive_catalog.drive_service.Request")
-    @patch("gdrive_catalog.drive_service.pickle")
-    @patch("gdrive_catalog.drive_service.Path")
-    def test_authenticate_refresh_expired_token(
-        self, mock_path, mock_pickle, mock_request, mock_build
-    ):
+    def test_authenticate_refresh_expired_token(self, auth_fakes, tmp_path, monkeypatch):
         """Test authentication refreshes expired token."""
+        monkeypatch.chdir(tmp_path)
         # Token exists
-        mock_path.return_value.exists.return_value = True
+        auth_fakes.path.return_value.exists.return_value = True
 
         # Mock expired credentials with refresh token
         mock_creds = MagicMock()
         mock_creds.valid = False
         mock_creds.expired = True
         mock_creds.refresh_token = "refresh_token_value"
-        mock_pickle.load.return_value = mock_creds
-
-        mock_build.return_value = MagicMock()
+        mock_creds.to_json.return_value = "{}"
+        auth_fakes.credentials.from_authorized_user_file.return_value = mock_creds
 
-        with patch("builtins.open", mock_open()):
-            service = DriveService(credentials_path="creds.json")
+        service = DriveService(credentials_path="creds.json")
 
-        mock_creds.refresh.assert_called_once()
-        mock_build.assert_called_once()
+        mock_creds.refresh.assert_called_once_with(auth_fakes.request.return_value)
+        assert (tmp_path / "token.json").read_text() == "{}"
+        assert not (tmp_path / "token.json.tmp").exists()
+        auth_fakes.build.assert_called_once()
         assert service.service is not None
 
 
+class TestDriveServiceHttp:
+    """Tests for the per-thread HTTP transport."""
+
+    def test_http_without_credentials(self, drive_service):
+        """Test that no transport is created without credentials."""
+        assert drive_service._http() is None
+
+    @patch("gdrive_catalog.drive_service.AuthorizedHttp")
+    def test_http_reused_within_thread(self, mock_authorized_http, drive_service):
+        """Test that a thread reuses its transport."""
+        drive_service.credentials = MagicMock()
+
+        assert drive_service._http() is drive_service._http()
+        mock_authorized_http.assert_called_once()
+
+    def test_http_has_socket_timeout(self, drive_service):
+        """Test that transports time out instead of blocking a worker forever."""
+        drive_service.credentials = MagicMock()
+
+        assert drive_service._http().http.timeout == DEFAULT_HTTP_TIMEOUT_SEC
+
+    @patch("gdrive_catalog.drive_service.build_http")
+    def test_http_requests_gzip_responses(self, mock_build_http, drive_service):
+        """Test that API requests identify the app and keep the gzip markers."""
+        transport = HttpMock(headers={"status": "200"})
+        mock_build_http.return_value = transport
+        drive_service.credentials = MagicMock()
+
+        # Headers as googleapiclient's JsonModel sets them on every API call
+        headers = {"accept-encoding": "gzip, deflate", "user-agent": "(gzip)"}
+        drive_service._http().request("https://www.googleapis.com/drive/v3/files", headers=headers)
+
+        assert transport.headers["user-agent"] == f"{USER_AGENT} (gzip)"
+        assert transport.headers["accept-encoding"] == "gzip, deflate"
+
+    @patch("gdrive_catalog.drive_service.build_http")
+    def test_http_reports_rate_limits_to_limiter(self, mock_build_http, drive_service):
+        """Test that every request takes a token and reports throttling."""
+        mock_build_http.return_value = HttpMockSequence(
+            [
+                ({"status": "429"}, b"rateLimitExceeded"),
+                ({"status": "403"}, b'{"reason": "userRateLimitExceeded"}'),
+                ({"status": "503"}, b"backendError"),
+                ({"status": "200"}, b"{}"),
+            ]
+        )
+        drive_service.credentials = MagicMock()
+        drive_service.rate_limiter = MagicMock()
+
+        http = drive_service._http()
+        for _ in range(4):
+            http.request("https://www.googleapis.com/drive/v3/files")
+
+        assert drive_service.rate_limiter.acquire.call_count == 4
+        # Server errors are neither throttling nor a reason to speed up
+        assert drive_service.rate_limiter.record_throttled.call_count == 2
+        drive_service.rate_limiter.record_success.assert_called_once()
+
+    @patch("gdrive_catalog.drive_service.AuthorizedHttp")
+    def test_http_separate_per_thread(self, mock_authorized_http, drive_service):
+        """Test that each thread gets its own transport."""
+        mock_authorized_http.side_effect = lambda *args, **kwargs: MagicMock()
+        drive_service.credentials = MagicMock()
+
+        transports = []
+        thread = threading.Thread(target=lambda: transports.append(drive_service._http()))
+        thread.start()
+        thread.join()
+
+        assert transports[0] is not drive_service._http()
+        assert mock_authorized_http.call_count == 2
+
+
 class TestDriveServiceListFiles:
     """Tests for the list_files method."""
 
-    @patch("gdrive_catalog.drive_service.DriveService._authenticate")
-    def test_list_files_basic(self, mock_auth):
+    def test_list_files_basic(self, drive_service):
         """Test basic file listing."""
-        mock_service = MagicMock()
-        mock_auth.return_value = mock_service
-
-        expected_result = {
-            "files": [{"id": "file1", "name": "test.txt"}],
-            "nextPageToken": None,
-        }
-        mock_service.files().list().execute.return_value = expected_result
+        mock_service = drive_service.service
+        mock_service.files().list().execute.return_value = LIST_RESULT
 
-        service = DriveService()
-        result = service.list_files()
+        result = drive_service.list_files()
 
-        assert result == expected_result
+        assert result == LIST_RESULT
 
-    @patch("gdrive_catalog.drive_service.DriveService._authenticate")
-    def test_list_files_with_folder_id(self, mock_auth):
+    def test_list_files_with_folder_id(self, drive_service):
         """Test file listing with folder ID."""
-        mock_service = MagicMock()
-        mock_auth.return_value = mock_service
+        mock_service = drive_service.service
 
         expected_result = {"files": [], "nextPageToken": None}
         mock_service.files().list().execute.return_value = expected_result
 
-        service = DriveService()
-        service.list_files(folder_id="folder123")
+        drive_service.list_files(folder_id="folder123")
 
         # Verify the query was constructed correctly
         mock_service.files().list.assert_called()
 
-    @patch("gdrive_catalog.drive_service.DriveService._authenticate")
-    def test_list_files_with_pagination(self, mock_auth):
+    def test_list_files_default_fields_omit_media_metadata(self, drive_service):
+        """Test that listings request a lean field mask by default."""
+        mock_service = drive_service.service
+        mock_service.files().list().execute.return_value = {"files": []}
+
+        drive_service.list_files()
+
+        fields = mock_service.files().list.call_args.kwargs["fields"]
+        assert fields == LIST_FIELDS
+        assert mock_service.files().list.call_args.kwargs["pageSize"] == LIST_PAGE_SIZE == 1000
+        # Transient errors are retried by the client library
+        mock_service.files().list().execute.assert_called_once()
+        assert mock_service.files().list().execute.call_args.kwargs["num_retries"] == NUM_RETRIES
+        assert "videoMediaMetadata" not in fields
+
+    def test_list_files_custom_fields(self, drive_service):
+        """Test that callers can opt into extra fields."""
+        mock_service = drive_service.service
+        mock_service.files().list().execute.return_value = {"files": []}
+
+        drive_service.list_files(fields="nextPageToken, files(id, videoMediaMetadata)")
+
+        fields = mock_service.files().list.call_args.kwargs["fields"]
+        assert fields == "nextPageToken, files(id, videoMediaMetadata)"
+
+    def test_list_files_with_pagination(self, drive_service):
         """Test file listing with pagination."""
-        mock_service = MagicMock()
-        mock_auth.return_value = mock_service
+        mock_service = drive_service.service
 
         expected_result = {"files": [], "nextPageToken": "next_token"}
         mock_service.files().list().execute.return_value = expected_result
 
-        service = DriveService()
-        service.list_files(page_token="current_token", page_size=500)
+        drive_service.list_files(page_token="current_token", page_size=500)
 
         mock_service.files().list.assert_called()
 
-    @patch("gdrive_catalog.drive_service.DriveService._authenticate")
-    def test_list_files_http_error(self, mock_auth):
-        """Test file listing with HTTP error."""
-        from googleapiclient.errors import HttpError
+    def test_list_files_exclude_folders(self, drive_service):
+        """Test that folders can be left out of a listing."""
+        mock_service = drive_service.service
+        mock_service.files().list().execute.return_value = {"files": []}
 
-        mock_service = MagicMock()
-        mock_auth.return_value = mock_service
+        drive_service.list_files(folder_id="folder123", exclude_folders=True)
 
-        # Create a mock HttpError
-        mock_resp = MagicMock()
-        mock_resp.status = 403
-        http_error = HttpError(resp=mock_resp, content=b"Access denied")
+        query = mock_service.files().list.call_args.kwargs["q"]
+        assert query == (
+            "'folder123' in parents and trashed=false"
+            " and mimeType != 'application/vnd.google-apps.folder'"
+        )
 
-        mock_service.files().list().execute.side_effect = http_error
+    def test_list_files_exclude_workspace(self, drive_service):
+        """Test that Google Workspace documents can be filtered out by the query."""
+        mock_service = drive_service.service
+        mock_service.files().list().execute.return_value = {"files": []}
 
-        service = DriveService()
+        drive_service.list_files(folder_id="folder123", exclude_workspace=True)
+
+        query = mock_service.files().list.call_args.kwargs["q"]
+        assert query.startswith("'folder123' in parents and trashed=false and ")
+        for mime_type in WORKSPACE_MIME_TYPES:
+            assert f"mimeType != '{mime_type}'" in query
+        assert "application/vnd.google-apps.folder" not in query
+
+    def test_list_files_query_reused_across_pages(self, drive_service):
+        """Test that paging through one folder reuses the same query string."""
+        mock_service = drive_service.service
+        mock_service.files().list().execute.return_value = {"files": []}
+
+        drive_service.list_files(folder_id="folder123")
+        first_query = mock_service.files().list.call_args.kwargs["q"]
+        drive_service.list_files(folder_id="folder123", page_token="token")
+
+        assert mock_service.files().list.call_args.kwargs["q"] is first_query
+
+    def test_list_files_retries_rate_limited_requests(self, drive_service, monkeypatch):
+        """Test that a throttled listing backs off and succeeds on a later attempt."""
+        sleeps = _serve_responses(
+            drive_service,
+            monkeypatch,
+            [RATE_LIMITED, RATE_LIMITED, ({"status": "200"}, json.dumps(LIST_RESULT))],
+        )
+
+        assert drive_service.list_files() == LIST_RESULT
+        assert len(sleeps) == 2
+        assert drive_service.rate_limiter.rate < DEFAULT_MAX_RATE
+
+    def test_list_files_gives_up_after_retries(self, drive_service, monkeypatch):
+        """Test that a listing still throttled after every retry fails."""
+        sleeps = _serve_responses(drive_service, monkeypatch, [RATE_LIMITED] * (NUM_RETRIES + 1))
+
+        with pytest.raises(FileListError) as exc_info:
+            drive_service.list_files()
+
+        assert exc_info.value.status_code == 429
+        assert len(sleeps) == NUM_RETRIES
+
+
+class TestDriveServiceListFolders:
+    """Tests for the list_folders method."""
+
+    def test_list_folders_whole_drive(self, drive_service):
+        """Test that folder listings query only folders with a narrow mask."""
+        mock_service = drive_service.service
+        expected_result = {"files": [{"id": "folder1", "name": "Folder"}]}
+        mock_service.files().list().execute.return_value = expected_result
+
+        result = drive_service.list_folders()
+
+        assert result == expected_result
+        kwargs = mock_service.files().list.call_args.kwargs
+        assert kwargs["q"] == "mimeType = 'application/vnd.google-apps.folder' and trashed=false"
+        assert kwargs["fields"] == FOLDER_FIELDS
+
+    def test_list_folders_with_folder_id(self, drive_service):
+        """Test that folder listings can be scoped to a parent folder."""
+        mock_service = drive_service.service
+        mock_service.files().list().execute.return_value = {"files": []}
+
+        drive_service.list_folders(folder_id="folder123", page_token="token")
+
+        kwargs = mock_service.files().list.call_args.kwargs
+        assert kwargs["q"] == (
+            "'folder123' in parents and "
+            "mimeType = 'application/vnd.google-apps.folder' and trashed=false"
+        )
+        assert kwargs["pageToken"] == "token"
+
+    def test_list_folders_http_error(self, drive_service):
+        """Test folder listing with HTTP error."""
+        mock_service = drive_service.service
+        mock_service.files().list().execute.side_effect = _http_error(404, b"Not found")
 
         with pytest.raises(FileListError) as exc_info:
-            service.list_files()
+            drive_service.list_folders(folder_id="missing")
 
-        assert exc_info.value.status_code == 403
+        assert exc_info.value.status_code == 404
+        assert exc_info.value.folder_id == "missing"
 
 
 class TestDriveServiceGetFileMetadata:
     """Tests for the get_file_metadata method."""
 
-    @patch("gdrive_catalog.drive_service.DriveService._authenticate")
-    def test_get_file_metadata_basic(self, mock_auth):
+    def test_get_file_metadata_basic(self, drive_service):
         """Test getting file metadata."""
-        mock_service = MagicMock()
-        mock_auth.return_value = mock_service
-
-        expected_result = {
-            "id": "file123",
-            "name": "document.pdf",
-            "mimeType": "application/pdf",
-            "size": "2048",
-        }
-        mock_service.files().get().execute.return_value = expected_result
+        mock_service = drive_service.service
+        mock_service.files().get().execute.return_value = METADATA_RESULT
 
-        service = DriveService()
-        result = service.get_file_metadata("file123")
+        result = drive_service.get_file_metadata("file123")
 
-        assert result == expected_result
+        assert result == METADATA_RESULT
 
-    @patch("gdrive_catalog.drive_service.DriveService._authenticate")
-    def test_get_file_metadata_http_error(self, mock_auth):
-        """Test getting file metadata with HTTP error."""
-        from googleapiclient.errors import HttpError
+    def test_get_file_metadata_custom_fields(self, drive_service):
+        """Test getting file metadata with a narrowed field mask."""
+        mock_service = drive_service.service
+        mock_service.files().get().execute.return_value = {"id": "file123"}
 
-        mock_service = MagicMock()
-        mock_auth.return_value = mock_service
+        drive_service.get_file_metadata("file123", fields="id, videoMediaMetadata")
 
-        mock_resp = MagicMock()
-        mock_resp.status = 404
-        http_error = HttpError(resp=mock_resp, content=b"Not found")
+        mock_service.files().get.assert_called_with(
+            fileId="file123", fields="id, videoMediaMetadata"
+        )
 
-        mock_service.files().get().execute.side_effect = http_error
 
-        service = DriveService()
+class FakeBatch:
+    """Stand-in for BatchHttpRequest that answers every sub-request."""
 
-        with pytest.raises(FileMetadataError) as exc_info:
-            service.get_file_metadata("nonexistent_file")
+    def __init__(self, callback, responses):
+        self.callback = callback
+        self.responses = responses
+        self.request_ids = []
 
-        assert exc_info.value.status_code == 404
-        assert exc_info.value.file_id == "nonexistent_file"
+    def add(self, request, request_id):
+        self.request_ids.append(request_id)
 
+    def execute(self, http=None):
+        for request_id in self.request_ids:
+            response = self.responses.get(request_id)
+            if isinstance(response, list):
+                # Successive outcomes for a lookup that is retried
+                response = response.pop(0)
+            if isinstance(response, Exception):
+                self.callback(request_id, None, response)
+                continue
+            exception = None if response is not None else Exception("Not found")
+            self.callback(request_id, response, exception)
 
-class TestDriveServiceDownloadFile:
-    """Tests for the download_file method."""
 
-    @patch("gdrive_catalog.drive_service.DriveService._authenticate")
-    def test_download_file_basic(self, mock_auth):
-        """Test downloading a file."""
-        mock_service = MagicMock()
-        mock_auth.return_value = mock_service
+class TestDriveServiceGetFileMetadataBatch:
+    """Tests for the get_file_metadata_batch method."""
 
-        expected_content = b"file content here"
-        mock_service.files().get_media().execute.return_value = expected_content
+    @staticmethod
+    def _fake_batches(drive_service, responses):
+        """Make the service's batches answer from ``responses``."""
+        batches = []
 
-        service = DriveService()
-        result = service.download_file("file123")
+        def new_batch_http_request(callback):
+            batches.append(FakeBatch(callback, responses))
+            return batches[-1]
 
-        assert result == expected_content
+        drive_service.service.new_batch_http_request.side_effect = new_batch_http_request
+        return batches
 
-    @patch("gdrive_catalog.drive_service.DriveService._authenticate")
-    def test_download_file_http_error(self, mock_auth):
-        """Test downloading a file with HTTP error."""
-        from googleapiclient.errors import HttpError
+    def test_batch_collects_results(self, drive_service):
+        """Test that batch results are keyed by file ID."""
+        responses = {"a": {"id": "a"}, "b": {"id": "b"}}
+        batches = self._fake_batches(drive_service, responses)
 
-        mock_service = MagicMock()
-        mock_auth.return_value = mock_service
+        result = drive_service.get_file_metadata_batch(["a", "b"])
 
-        mock_resp = MagicMock()
-        mock_resp.status = 500
-        http_error = HttpError(resp=mock_resp, content=b"Server error")
+        assert result == responses
+        assert len(batches) == 1
 
-        mock_service.files().get_media().execute.side_effect = http_error
+    def test_batch_skips_failed_lookups(self, drive_service):
+        """Test that failed sub-requests are left out of the result."""
+        self._fake_batches(drive_service, {"a": {"id": "a"}})
 
-        service = DriveService()
+        result = drive_service.get_file_metadata_batch(["a", "missing"])
+
+        assert result == {"a": {"id": "a"}}
+
+    @patch("gdrive_catalog.drive_service.time.sleep")
+    def test_batch_logs_failed_lookups(self, mock_sleep, drive_service, caplog):
+        """Test that rejected sub-requests are logged with their file ID."""
+        batches = self._fake_batches(
+            drive_service, {"a": {"id": "a"}, "limited": _http_error(429, b"userRateLimitExceeded")}
+        )
+
+        with caplog.at_level(logging.DEBUG, logger="gdrive_catalog.drive_service"):
+            result = drive_service.get_file_metadata_batch(["a", "limited"])
+
+        assert result == {"a": {"id": "a"}}
+        assert "Failed to fetch metadata for file limited after" in caplog.text
+        # Exhausted retries lose data, so they are not hidden at debug level
+        assert caplog.records[-1].levelno == logging.WARNING
+        assert "a" not in [record.args[0] for record in caplog.records]
+        # The rate-limited lookup alone is retried until retries run out
+        assert [b.request_ids for b in batches[1:]] == [["limited"]] * NUM_RETRIES
+        assert mock_sleep.call_count == NUM_RETRIES
+
+    @patch("gdrive_catalog.drive_service.time.sleep")
+    def test_batch_retries_rate_limited_lookups(self, mock_sleep, drive_service):
+        """Test that rate-limited sub-requests are retried with backoff."""
+        responses = {
+            "a": {"id": "a"},
+            "b": [_http_error(403, b'{"reason": "userRateLimitExceeded"}'), {"id": "b"}],
+            "c": [_http_error(503, b"backendError"), {"id": "c"}],
+        }
+        batches = self._fake_batches(drive_service, responses)
+
+        result = drive_service.get_file_metadata_batch(["a", "b", "c"])
+
+        assert result == {"a": {"id": "a"}, "b": {"id": "b"}, "c": {"id": "c"}}
+        assert [b.request_ids for b in batches] == [["a", "b", "c"], ["b", "c"]]
+        mock_sleep.assert_called_once()
+        assert 0 <= mock_sleep.call_args.args[0] <= 2
+
+    @patch("gdrive_catalog.drive_service.time.sleep")
+    def test_batch_does_not_retry_permanent_errors(self, mock_sleep, drive_service):
+        """Test that missing or forbidden files are not retried."""
+        responses = {
+            "missing": _http_error(404, b"notFound"),
+            "forbidden": _http_error(403, b"insufficientFilePermissions"),
+        }
+        batches = self._fake_batches(drive_service, responses)
+
+        assert drive_service.get_file_metadata_batch(["missing", "forbidden"]) == {}
+        assert len(batches) == 1
+        mock_sleep.assert_not_called()
+
+    def test_batch_chunks_large_requests(self, drive_service):
+        """Test that requests are split to respect the batch size limit."""
+        file_ids = [f"file{i}" for i in range(MAX_BATCH_SIZE + 1)]
+        batches = self._fake_batches(drive_service, {})
+        drive_service.rate_limiter = MagicMock()
+
+        drive_service.get_file_metadata_batch(file_ids)
+
+        assert [len(b.request_ids) for b in batches] == [MAX_BATCH_SIZE, 1]
+        # Each lookup takes a token; the transport takes one more per batch request
+        assert drive_service.rate_limiter.acquire.call_args_list == [
+            call(MAX_BATCH_SIZE - 1),
+            call(0),
+        ]
+
+    @patch("gdrive_catalog.drive_service.time.sleep")
+    def test_batch_rate_limited_lookups_slow_down_limiter(self, mock_sleep, drive_service):
+        """Test that throttled lookups are reported although the batch succeeded."""
+        responses = {
+            "a": {"id": "a"},
+            "b": [_http_error(429, b"rateLimitExceeded"), {"id": "b"}],
+            "c": [_http_error(503, b"backendError"), {"id": "c"}],
+        }
+        self._fake_batches(drive_service, responses)
+
+        drive_service.get_file_metadata_batch(["a", "b", "c"])
+
+        assert drive_service.rate_limiter.rate == pytest.approx(
+            DEFAULT_MAX_RATE * drive_service.rate_limiter.decrease_factor
+        )
+
+    def test_batch_deduplicates_ids(self, drive_service):
+        """Test that repeated IDs are only requested once."""
+        batches = self._fake_batches(drive_service, {})
+
+        drive_service.get_file_metadata_batch(["a", "a", "b"])
+
+        assert batches[0].request_ids == ["a", "b"]
+
+    def test_batch_http_error(self, drive_service):
+        """Test that a failed batch request raises DriveServiceError."""
+        mock_service = drive_service.service
+        http_error = _http_error(503, b"Unavailable")
+        mock_service.new_batch_http_request.return_value.execute.side_effect = http_error
+
+        with pytest.raises(DriveServiceError) as exc_info:
+            drive_service.get_file_metadata_batch(["a"])
+
+        assert exc_info.value.status_code == 503
+
+
+class TestDriveServiceDownloadFile:
+    """Tests for the download_file method."""
+
+    def test_download_file_basic(self, drive_service):
+        """Test downloading a file."""
+        mock_service = drive_service.service
+        mock_service.files().get_media().execute.return_value = FILE_CONTENT
+
+        result = drive_service.download_file("file123")
+
+        assert result == FILE_CONTENT
+
+
+class TestDriveServiceHttpErrors:
+    """Tests for wrapping HttpError in the service's own exceptions."""
+
+    @pytest.mark.parametrize(
+        ("request_name", "method", "args", "status", "error_class", "file_id"),
+        [
+            ("list", "list_files", (), 403, FileListError, None),
+            (
+                "get",
+                "get_file_metadata",
+                ("nonexistent_file",),
+                404,
+                FileMetadataError,
+                "nonexistent_file",
+            ),
+            ("get_media", "download_file", ("file123",), 500, FileDownloadError, "file123"),
+        ],
+        ids=["list_files", "get_file_metadata", "download_file"],
+    )
+    def test_http_error_is_wrapped(
+        self, drive_service, request_name, method, args, status, error_class, file_id
+    ):
+        """Test that API failures surface as the matching error with their status."""
+        request = getattr(drive_service.service.files(), request_name)
+        request().execute.side_effect = _http_error(status, b"Request failed")
 
-        with pytest.raises(FileDownloadError) as exc_info:
-            service.download_file("file123")
+        with pytest.raises(error_class) as exc_info:
+            getattr(drive_service, method)(*args)
 
-        assert exc_info.value.status_code == 500
-        assert exc_info.value.file_id == "file123"
+        assert exc_info.value.status_code == status
+        assert getattr(exc_info.value, "file_id", None) == file_id
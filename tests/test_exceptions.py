@@ -1,6 +1,6 @@
 """Tests for custom exception classes."""
 
-from unittest.mock import MagicMock
+from types import SimpleNamespace
 
 import pytest
 
@@ -12,6 +12,11 @@ from gdrive_catalog.exceptions import (
 )
 
 
+def _http_error(status):
+    """Stand in for an HttpError, which only needs ``resp.status`` here."""
+    return SimpleNamespace(resp=SimpleNamespace(status=status))
+
+
 class TestDriveServiceError:
     """Tests for DriveServiceError base exception."""
 
@@ -30,10 +35,17 @@ class TestDriveServiceError:
         assert str(error) == "Failed to list files: API error"
         assert error.operation == "list files"
 
+    def test_message_formatted_on_demand(self):
+        """Test that the descriptive message is only built when rendered."""
+        error = DriveServiceError("API error", operation="list files")
+        assert error.args == ("API error",)
+
+        error.operation = "list folders"
+        assert str(error) == "Failed to list folders: API error"
+
     def test_with_mock_http_error(self):
         """Test exception with mocked HttpError."""
-        mock_error = MagicMock()
-        mock_error.resp.status = 404
+        mock_error = _http_error(404)
 
         error = DriveServiceError(
             "Not found",
@@ -56,100 +68,61 @@ class TestDriveServiceError:
             raise DriveServiceError("Test error", operation="test")
 
 
-class TestFileListError:
-    """Tests for FileListError exception."""
-
-    def test_without_folder_id(self):
-        """Test error when listing root files."""
-        error = FileListError("Access denied")
-        assert "list files" in str(error)
-        assert error.folder_id is None
-
-    def test_with_folder_id(self):
-        """Test error when listing specific folder."""
-        error = FileListError("Not found", folder_id="abc123")
-        assert "list files in folder 'abc123'" in str(error)
-        assert error.folder_id == "abc123"
-
-    def test_with_http_error(self):
-        """Test error with HTTP status code."""
-        mock_error = MagicMock()
-        mock_error.resp.status = 403
-
-        error = FileListError(
-            "Permission denied",
-            folder_id="xyz789",
-            original_error=mock_error,
-        )
-
-        assert "(HTTP 403)" in str(error)
-        assert error.status_code == 403
-
-    def test_inheritance(self):
-        """Test that FileListError inherits from DriveServiceError."""
-        error = FileListError("Test")
-        assert isinstance(error, DriveServiceError)
-        assert isinstance(error, Exception)
-
-
-class TestFileMetadataError:
-    """Tests for FileMetadataError exception."""
-
-    def test_basic_usage(self):
-        """Test basic file metadata error."""
-        error = FileMetadataError("File not found", file_id="file123")
-        assert "get metadata for file 'file123'" in str(error)
-        assert error.file_id == "file123"
-
-    def test_with_http_error(self):
+class TestSpecificErrors:
+    """Tests for FileListError, FileMetadataError and FileDownloadError."""
+
+    @pytest.mark.parametrize(
+        ("error", "operation", "attribute", "value"),
+        [
+            (FileListError("Access denied"), "list files", "folder_id", None),
+            (
+                FileListError("Not found", folder_id="abc123"),
+                "list files in folder 'abc123'",
+                "folder_id",
+                "abc123",
+            ),
+            (
+                FileMetadataError("File not found", file_id="file123"),
+                "get metadata for file 'file123'",
+                "file_id",
+                "file123",
+            ),
+            (
+                FileDownloadError("Download failed", file_id="download123"),
+                "download file 'download123'",
+                "file_id",
+                "download123",
+            ),
+        ],
+        ids=["list", "list-folder", "metadata", "download"],
+    )
+    def test_message_names_operation(self, error, operation, attribute, value):
+        """Test that the message describes the failed operation and keeps its target."""
+        assert operation in str(error)
+        assert getattr(error, attribute) == value
+
+    @pytest.mark.parametrize(
+        ("cls", "kwargs", "status"),
+        [
+            (FileListError, {"folder_id": "xyz789"}, 403),
+            (FileMetadataError, {"file_id": "file456"}, 404),
+            (FileDownloadError, {"file_id": "file789"}, 500),
+        ],
+        ids=["list", "metadata", "download"],
+    )
+    def test_with_http_error(self, cls, kwargs, status):
         """Test error with HTTP status code."""
-        mock_error = MagicMock()
-        mock_error.resp.status = 404
-
-        error = FileMetadataError(
-            "Not found",
-            file_id="file456",
-            original_error=mock_error,
-        )
-
-        assert "(HTTP 404)" in str(error)
-        assert error.status_code == 404
-
-    def test_inheritance(self):
-        """Test that FileMetadataError inherits from DriveServiceError."""
-        error = FileMetadataError("Test", file_id="abc")
-        assert isinstance(error, DriveServiceError)
-        assert isinstance(error, Exception)
+        mock_error = _http_error(status)
 
+        error = cls("Request failed", original_error=mock_error, **kwargs)
 
-class TestFileDownloadError:
-    """Tests for FileDownloadError exception."""
+        assert f"(HTTP {status})" in str(error)
+        assert error.status_code == status
 
-    def test_basic_usage(self):
-        """Test basic file download error."""
-        error = FileDownloadError("Download failed", file_id="download123")
-        assert "download file 'download123'" in str(error)
-        assert error.file_id == "download123"
-
-    def test_with_http_error(self):
-        """Test error with HTTP status code."""
-        mock_error = MagicMock()
-        mock_error.resp.status = 500
-
-        error = FileDownloadError(
-            "Server error",
-            file_id="file789",
-            original_error=mock_error,
-        )
-
-        assert "(HTTP 500)" in str(error)
-        assert error.status_code == 500
-
-    def test_inheritance(self):
-        """Test that FileDownloadError inherits from DriveServiceError."""
-        error = FileDownloadError("Test", file_id="abc")
-        assert isinstance(error, DriveServiceError)
-        assert isinstance(error, Exception)
+    @pytest.mark.parametrize("cls", [FileListError, FileMetadataError, FileDownloadError])
+    def test_inheritance(self, cls):
+        """Test that specific errors inherit from DriveServiceError."""
+        assert issubclass(cls, DriveServiceError)
 
 
 class TestExceptionChaining:
@@ -169,8 +142,7 @@ class TestExceptionChaining:
 
     def test_exception_chain_preserved(self):
         """Test that exception chaining preserves the original error."""
-        mock_original = MagicMock()
-        mock_original.resp.status = 401
+        mock_original = _http_error(401)
 
         try:
             try:
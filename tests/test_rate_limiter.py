@@ -0,0 +1,120 @@
+"""Tests for the AdaptiveRateLimiter module."""
+
+import pytest
+
+from gdrive_catalog.rate_limiter import DEFAULT_MAX_RATE, AdaptiveRateLimiter
+
+
+class FakeClock:
+    """Clock that only advances when the limiter sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _limiter(clock, **kwargs):
+    """Build a limiter driven by a fake clock."""
+    return AdaptiveRateLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+class TestAdaptiveRateLimiterAcquire:
+    """Tests for the acquire method."""
+
+    def test_starts_at_max_rate(self):
+        """Test that the limiter starts at the maximum rate."""
+        assert AdaptiveRateLimiter().rate == DEFAULT_MAX_RATE
+
+    def test_burst_does_not_wait(self):
+        """Test that a full bucket serves a burst without sleeping."""
+        clock = FakeClock()
+        limiter = _limiter(clock, max_rate=5)
+
+        for _ in range(5):
+            limiter.acquire()
+
+        assert clock.sleeps == []
+
+    def test_waits_once_bucket_is_empty(self):
+        """Test that requests beyond the bucket are spaced at the current rate."""
+        clock = FakeClock()
+        limiter = _limiter(clock, max_rate=5)
+
+        for _ in range(7):
+            limiter.acquire()
+
+        assert clock.sleeps == pytest.approx([0.2, 0.2])
+
+    def test_acquire_several_tokens(self):
+        """Test that a weighted request waits for all of its tokens."""
+        clock = FakeClock()
+        limiter = _limiter(clock, max_rate=5)
+
+        limiter.acquire(5)
+        limiter.acquire(3)
+
+        assert clock.sleeps == pytest.approx([0.6])
+
+    def test_refills_over_time(self):
+        """Test that tokens come back as time passes."""
+        clock = FakeClock()
+        limiter = _limiter(clock, max_rate=5)
+        for _ in range(5):
+            limiter.acquire()
+
+        clock.now += 1.0
+        for _ in range(5):
+            limiter.acquire()
+
+        assert clock.sleeps == []
+
+
+class TestAdaptiveRateLimiterFeedback:
+    """Tests for the throttling feedback."""
+
+    def test_throttling_decreases_rate(self):
+        """Test that each throttled request cuts the rate multiplicatively."""
+        limiter = AdaptiveRateLimiter(max_rate=10, decrease_factor=0.5)
+
+        limiter.record_throttled()
+        assert limiter.rate == 5
+        limiter.record_throttled()
+        assert limiter.rate == 2.5
+
+    def test_rate_never_drops_below_minimum(self):
+        """Test that sustained throttling stops at the minimum rate."""
+        limiter = AdaptiveRateLimiter(max_rate=10, min_rate=2)
+
+        for _ in range(50):
+            limiter.record_throttled()
+
+        assert limiter.rate == 2
+
+    def test_success_increases_rate_up_to_maximum(self):
+        """Test that successful requests raise the rate additively."""
+        limiter = AdaptiveRateLimiter(max_rate=10, decrease_factor=0.5, increase_step=1)
+        limiter.record_throttled()
+
+        limiter.record_success()
+        assert limiter.rate == 6
+        for _ in range(10):
+            limiter.record_success()
+        assert limiter.rate == 10
+
+    def test_throttling_spaces_out_requests(self):
+        """Test that a lower rate makes waiting requests sleep longer."""
+        clock = FakeClock()
+        limiter = _limiter(clock, max_rate=4, decrease_factor=0.5)
+        limiter.record_throttled()
+
+        for _ in range(3):
+            limiter.acquire()
+
+        assert clock.sleeps == pytest.approx([0.5])
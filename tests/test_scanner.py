@@ -1,19 +1,40 @@
 """Tests for the DriveScanner module."""
 
+import threading
 from unittest.mock import MagicMock
 
+import pytest
+
+from gdrive_catalog.exceptions import DriveServiceError, FileMetadataError
 from gdrive_catalog.scanner import DriveScanner
 
 
+@pytest.fixture
+def mock_drive_service():
+    """Drive service mock, configured per test before the scanner calls it."""
+    return MagicMock()
+
+
+@pytest.fixture
+def scanner(mock_drive_service):
+    """Scanner with empty folder caches over the mock Drive service."""
+    return DriveScanner(mock_drive_service)
+
+
 class TestDriveScannerInit:
     """Tests for DriveScanner initialization."""
 
-    def test_init_with_drive_service(self):
+    def test_init_with_drive_service(self, mock_drive_service, scanner):
         """Test that scanner initializes with a drive service."""
-        mock_service = MagicMock()
-        scanner = DriveScanner(mock_service)
-        assert scanner.drive_service is mock_service
+        assert scanner.drive_service is mock_drive_service
         assert scanner.folder_cache == {}
+        assert scanner.folder_paths == {}
+        assert scanner.max_workers == DriveScanner.DEFAULT_MAX_WORKERS
+
+    def test_init_with_max_workers(self, mock_drive_service):
+        """Test that scanner accepts a custom worker count."""
+        scanner = DriveScanner(mock_drive_service, max_workers=2)
+        assert scanner.max_workers == 2
 
 
 class TestDriveScannerMimeTypes:
@@ -33,154 +54,184 @@ class TestDriveScannerMimeTypes:
         assert "video/quicktime" in DriveScanner.VIDEO_MIME_TYPES
         assert "video/webm" in DriveScanner.VIDEO_MIME_TYPES
 
+    def test_media_mime_types_cover_audio_and_video(self):
+        """Test that the combined media set is the frozen union of both."""
+        assert isinstance(DriveScanner.MEDIA_MIME_TYPES, frozenset)
+        assert DriveScanner.MEDIA_MIME_TYPES == (
+            DriveScanner.AUDIO_MIME_TYPES | DriveScanner.VIDEO_MIME_TYPES
+        )
+
 
 class TestExtractDuration:
     """Tests for the _extract_duration method."""
 
-    def test_extract_duration_from_video_metadata(self):
+    def test_extract_duration_from_video_metadata(self, scanner):
         """Test extracting duration from video metadata."""
-        mock_service = MagicMock()
-        scanner = DriveScanner(mock_service)
-
         file = {"videoMediaMetadata": {"durationMillis": "120000"}}
         duration = scanner._extract_duration(file)
         assert duration == 120000
 
-    def test_extract_duration_missing_metadata(self):
+    def test_extract_duration_missing_metadata(self, scanner):
         """Test duration extraction when metadata is missing."""
-        mock_service = MagicMock()
-        scanner = DriveScanner(mock_service)
-
         file = {}
         duration = scanner._extract_duration(file)
         assert duration is None
 
-    def test_extract_duration_empty_video_metadata(self):
+    def test_extract_duration_empty_video_metadata(self, scanner):
         """Test duration extraction when video metadata is empty."""
-        mock_service = MagicMock()
-        scanner = DriveScanner(mock_service)
-
         file = {"videoMediaMetadata": {}}
         duration = scanner._extract_duration(file)
         assert duration is None
 
 
-class TestExtractFileData:
-    """Tests for the _extract_file_data method."""
-
-    def test_extract_basic_file_data(self):
-        """Test extracting basic file data."""
-        mock_service = MagicMock()
-        scanner = DriveScanner(mock_service)
-
-        file = {
-            "id": "file123",
-            "name": "test_file.txt",
-            "mimeType": "text/plain",
-            "size": "1024",
-            "createdTime": "2024-01-15T10:30:00.000Z",
-            "webViewLink": "https://drive.google.com/file/d/file123/view",
-        }
-
-        data = scanner._extract_file_data(file)
-
-        assert data["id"] == "file123"
-        assert data["name"] == "test_file.txt"
-        assert data["size_bytes"] == "1024"
-        assert data["mime_type"] == "text/plain"
-        assert data["created_at"] == "2024-01-15T10:30:00.000Z"
-        assert data["link"] == "https://drive.google.com/file/d/file123/view"
-        assert data["duration_milliseconds"] == ""
-
-    def test_extract_file_data_with_video_duration(self):
-        """Test extracting file data with video duration."""
-        mock_service = MagicMock()
-        scanner = DriveScanner(mock_service)
-
-        file = {
-            "id": "video123",
-            "name": "test_video.mp4",
-            "mimeType": "video/mp4",
-            "size": "10485760",
-            "createdTime": "2024-01-15T10:30:00.000Z",
-            "webViewLink": "https://drive.google.com/file/d/video123/view",
-            "videoMediaMetadata": {"durationMillis": "60000"},
-        }
-
-        data = scanner._extract_file_data(file)
+class TestFetchMediaMetadata:
+    """Tests for the _fetch_media_metadata method."""
 
-        assert data["id"] == "video123"
-        assert data["duration_milliseconds"] == "60000"
-        assert data["mime_type"] == "video/mp4"
-
-    def test_extract_file_data_with_audio_no_duration(self):
-        """Test extracting file data for audio without duration metadata."""
-        mock_service = MagicMock()
-        scanner = DriveScanner(mock_service)
-
-        file = {
-            "id": "audio123",
-            "name": "song.mp3",
-            "mimeType": "audio/mpeg",
-            "size": "5242880",
-            "createdTime": "2024-01-15T10:30:00.000Z",
+    def test_fetch_media_metadata_merges_result(self, mock_drive_service, scanner):
+        """Test that batched media metadata is merged into video files."""
+        mock_drive_service.get_file_metadata_batch.return_value = {
+            "video1": {"id": "video1", "videoMediaMetadata": {"durationMillis": "5000"}},
         }
 
-        data = scanner._extract_file_data(file)
-
-        assert data["id"] == "audio123"
-        assert data["duration_milliseconds"] == ""
-        assert data["mime_type"] == "audio/mpeg"
+        files = scanner._fetch_media_metadata(
+            [
+                {"id": "video1", "name": "clip.mp4", "mimeType": "video/mp4"},
+                {"id": "file1", "name": "document.pdf", "mimeType": "application/pdf"},
+            ]
+        )
+
+        assert files[0]["name"] == "clip.mp4"
+        assert files[0]["videoMediaMetadata"] == {"durationMillis": "5000"}
+        assert "videoMediaMetadata" not in files[1]
+        mock_drive_service.get_file_metadata_batch.assert_called_once_with(
+            ["video1"], fields=DriveScanner.MEDIA_METADATA_FIELDS
+        )
+
+    def test_fetch_media_metadata_one_batch_per_page(self, mock_drive_service, scanner):
+        """Test that all videos of a page are resolved in a single call."""
+        mock_drive_service.get_file_metadata_batch.return_value = {}
+
+        scanner._fetch_media_metadata(
+            [{"id": f"video{i}", "mimeType": "video/mp4"} for i in range(3)]
+        )
+
+        mock_drive_service.get_file_metadata_batch.assert_called_once_with(
+            ["video0", "video1", "video2"], fields=DriveScanner.MEDIA_METADATA_FIELDS
+        )
+
+    def test_fetch_media_metadata_skips_when_present(self, mock_drive_service, scanner):
+        """Test that no request is made when metadata is already present."""
+        files = [
+            {
+                "id": "video1",
+                "mimeType": "video/mp4",
+                "videoMediaMetadata": {"durationMillis": "5000"},
+            }
+        ]
 
-    def test_extract_file_data_default_link_fallback(self):
-        """Test that default link is generated when webViewLink is missing."""
-        mock_service = MagicMock()
-        scanner = DriveScanner(mock_service)
+        assert scanner._fetch_media_metadata(files) is files
+        mock_drive_service.get_file_metadata_batch.assert_not_called()
 
-        file = {
-            "id": "file456",
-            "name": "file.txt",
-            "mimeType": "text/plain",
-        }
+    def test_fetch_media_metadata_handles_api_error(self, mock_drive_service, scanner):
+        """Test that API errors leave the files without duration."""
+        mock_drive_service.get_file_metadata_batch.side_effect = DriveServiceError(
+            "Server error", operation="get metadata for 1 files"
+        )
 
-        data = scanner._extract_file_data(file)
+        files = [{"id": "video1", "name": "clip.mp4", "mimeType": "video/mp4"}]
 
-        assert data["link"] == "https://drive.google.com/file/d/file456/view"
+        assert scanner._fetch_media_metadata(files) is files
 
-    def test_extract_file_data_missing_fields(self):
-        """Test extracting data when optional fields are missing."""
-        mock_service = MagicMock()
-        scanner = DriveScanner(mock_service)
 
-        file = {"id": "minimal123"}
+class TestExtractFileData:
+    """Tests for the _extract_file_data method."""
 
+    @pytest.mark.parametrize(
+        ("file", "expected"),
+        [
+            (
+                {
+                    "id": "file123",
+                    "name": "test_file.txt",
+                    "mimeType": "text/plain",
+                    "size": "1024",
+                    "createdTime": "2024-01-15T10:30:00.000Z",
+                    "webViewLink": "https://drive.google.com/file/d/file123/view",
+                },
+                {
+                    "id": "file123",
+                    "name": "test_file.txt",
+                    "size_bytes": "1024",
+                    "mime_type": "text/plain",
+                    "created_at": "2024-01-15T10:30:00.000Z",
+                    "link": "https://drive.google.com/file/d/file123/view",
+                    "duration_milliseconds": "",
+                },
+            ),
+            (
+                {
+                    "id": "video123",
+                    "name": "test_video.mp4",
+                    "mimeType": "video/mp4",
+                    "size": "10485760",
+                    "createdTime": "2024-01-15T10:30:00.000Z",
+                    "webViewLink": "https://drive.google.com/file/d/video123/view",
+                    "videoMediaMetadata": {"durationMillis": "60000"},
+                },
+                {"id": "video123", "duration_milliseconds": "60000", "mime_type": "video/mp4"},
+            ),
+            (
+                {
+                    "id": "audio123",
+                    "name": "song.mp3",
+                    "mimeType": "audio/mpeg",
+                    "size": "5242880",
+                    "createdTime": "2024-01-15T10:30:00.000Z",
+                },
+                {"id": "audio123", "duration_milliseconds": "", "mime_type": "audio/mpeg"},
+            ),
+            (
+                {"id": "file456", "name": "file.txt", "mimeType": "text/plain"},
+                {"link": "https://drive.google.com/file/d/file456/view"},
+            ),
+            (
+                {"id": "minimal123"},
+                {
+                    "id": "minimal123",
+                    "name": "",
+                    "size_bytes": "0",
+                    "created_at": "",
+                    "mime_type": "",
+                },
+            ),
+        ],
+        ids=[
+            "basic",
+            "video-duration",
+            "audio-no-duration",
+            "default-link-fallback",
+            "missing-fields",
+        ],
+    )
+    def test_extract_file_data(self, scanner, file, expected):
+        """Test that the catalog entry carries the file's fields or their defaults."""
         data = scanner._extract_file_data(file)
 
-        assert data["id"] == "minimal123"
-        assert data["name"] == ""
-        assert data["size_bytes"] == "0"
-        assert data["created_at"] == ""
-        assert data["mime_type"] == ""
+        assert expected.items() <= data.items()
 
 
 class TestBuildFilePath:
     """Tests for the _build_file_path method."""
 
-    def test_build_path_file_at_root(self):
+    def test_build_path_file_at_root(self, scanner):
         """Test building path for file at root level."""
-        mock_service = MagicMock()
-        scanner = DriveScanner(mock_service)
-
         file = {"name": "root_file.txt"}
 
         path = scanner._build_file_path(file)
         assert path == "/root_file.txt"
 
-    def test_build_path_with_parent_folder(self):
+    def test_build_path_with_parent_folder(self, scanner):
         """Test building path with parent folder from cache."""
-        mock_service = MagicMock()
-        scanner = DriveScanner(mock_service)
-
         # Pre-populate folder cache
         scanner.folder_cache["parent123"] = {"name": "Documents", "parent": None}
 
@@ -189,11 +240,8 @@ class TestBuildFilePath:
         path = scanner._build_file_path(file)
         assert path == "/Documents/report.pdf"
 
-    def test_build_path_with_nested_folders(self):
+    def test_build_path_with_nested_folders(self, scanner):
         """Test building path with nested folders from cache."""
-        mock_service = MagicMock()
-        scanner = DriveScanner(mock_service)
-
         # Pre-populate folder cache
         scanner.folder_cache["child_folder"] = {"name": "Reports", "parent": "parent_folder"}
         scanner.folder_cache["parent_folder"] = {"name": "Work", "parent": None}
@@ -203,31 +251,31 @@ class TestBuildFilePath:
         path = scanner._build_file_path(file)
         assert path == "/Work/Reports/annual.pdf"
 
-    def test_build_path_fetches_uncached_folder(self):
+    def test_build_path_fetches_uncached_folder(self, mock_drive_service, scanner):
         """Test that path building fetches uncached folder metadata."""
-        mock_drive_service = MagicMock()
-        mock_drive_service.service.files().get().execute.return_value = {
+        mock_drive_service.get_file_metadata.return_value = {
             "name": "NewFolder",
             "parents": [],
         }
 
-        scanner = DriveScanner(mock_drive_service)
-
         file = {"name": "file.txt", "parents": ["new_folder_id"]}
 
         path = scanner._build_file_path(file)
 
+        mock_drive_service.get_file_metadata.assert_called_once_with(
+            "new_folder_id", fields=DriveScanner.FOLDER_METADATA_FIELDS
+        )
+
         assert "NewFolder" in path
         assert "file.txt" in path
         # Verify folder was cached
         assert "new_folder_id" in scanner.folder_cache
 
-    def test_build_path_handles_api_error(self):
+    def test_build_path_handles_api_error(self, mock_drive_service, scanner):
         """Test that path building handles API errors gracefully."""
-        mock_drive_service = MagicMock()
-        mock_drive_service.service.files().get().execute.side_effect = Exception("API Error")
-
-        scanner = DriveScanner(mock_drive_service)
+        mock_drive_service.get_file_metadata.side_effect = FileMetadataError(
+            "API Error", file_id="error_folder_id"
+        )
 
         file = {"name": "file.txt", "parents": ["error_folder_id"]}
 
@@ -235,11 +283,8 @@ class TestBuildFilePath:
         path = scanner._build_file_path(file)
         assert "file.txt" in path
 
-    def test_build_path_detects_circular_reference(self):
+    def test_build_path_detects_circular_reference(self, scanner):
         """Test that path building detects and handles circular references."""
-        mock_service = MagicMock()
-        scanner = DriveScanner(mock_service)
-
         # Create circular reference in cache
         scanner.folder_cache["folder_a"] = {"name": "FolderA", "parent": "folder_b"}
         scanner.folder_cache["folder_b"] = {"name": "FolderB", "parent": "folder_a"}
@@ -250,37 +295,179 @@ class TestBuildFilePath:
         path = scanner._build_file_path(file)
         assert "file.txt" in path
 
+    def test_build_path_memoizes_folder_paths(self, scanner):
+        """Test that a folder's path is built once for all the files it holds."""
+        scanner.folder_cache["child_folder"] = {"name": "Reports", "parent": "parent_folder"}
+        scanner.folder_cache["parent_folder"] = {"name": "Work", "parent": None}
+
+        scanner._build_file_path({"name": "a.pdf", "parents": ["child_folder"]})
+        assert scanner.folder_paths == {"parent_folder": "/Work", "child_folder": "/Work/Reports"}
+
+        # Later files are resolved from the memoized path alone
+        scanner.folder_cache.clear()
+        path = scanner._build_file_path({"name": "b.pdf", "parents": ["child_folder"]})
+        assert path == "/Work/Reports/b.pdf"
+
+        # New folders only walk up to the nearest memoized ancestor
+        scanner.folder_cache["sibling"] = {"name": "Drafts", "parent": "parent_folder"}
+        path = scanner._build_file_path({"name": "c.pdf", "parents": ["sibling"]})
+        assert path == "/Work/Drafts/c.pdf"
+
+    def test_build_path_does_not_memoize_failed_lookups(self, mock_drive_service, scanner):
+        """Test that a path cut short by an API error is retried next time."""
+        mock_drive_service.get_file_metadata.side_effect = [
+            FileMetadataError("Rate limited", file_id="folder_id"),
+            {"name": "Folder", "parents": []},
+        ]
+        file = {"name": "file.txt", "parents": ["folder_id"]}
+
+        assert scanner._build_file_path(file) == "/file.txt"
+        assert scanner.folder_paths == {}
+        assert scanner._build_file_path(file) == "/Folder/file.txt"
+
+    def test_build_path_limits_depth(self, scanner):
+        """Test that very deep hierarchies stop at the depth limit."""
+        for depth in range(150):
+            scanner.folder_cache[f"folder{depth}"] = {
+                "name": f"f{depth}",
+                "parent": f"folder{depth + 1}",
+            }
+
+        path = scanner._build_file_path({"name": "file.txt", "parents": ["folder0"]})
+
+        assert path.count("/") == 101
+        assert scanner.folder_paths == {}
+
+
+class TestResolveAncestors:
+    """Tests for the _resolve_ancestors method."""
+
+    def test_resolve_ancestors_batches_each_level(self, mock_drive_service, scanner):
+        """Test that a page's unknown ancestors are fetched one level per batch."""
+        mock_drive_service.get_file_metadata_batch.side_effect = [
+            {
+                "folder_a": {"id": "folder_a", "name": "A", "parents": ["root"]},
+                "folder_b": {"id": "folder_b", "name": "B", "parents": ["root"]},
+            },
+            {"root": {"id": "root", "name": "My Drive"}},
+        ]
+        files = [
+            {"id": "file1", "name": "1.pdf", "parents": ["folder_a"]},
+            {"id": "file2", "name": "2.pdf", "parents": ["folder_b"]},
+            {"id": "file3", "name": "3.pdf", "parents": ["folder_a"]},
+        ]
+
+        scanner._resolve_ancestors(files)
+
+        calls = mock_drive_service.get_file_metadata_batch.call_args_list
+        assert [sorted(call.args[0]) for call in calls] == [["folder_a", "folder_b"], ["root"]]
+        assert scanner._build_file_path(files[1]) == "/My Drive/B/2.pdf"
+
+    def test_resolve_ancestors_skips_cached_folders(self, mock_drive_service, scanner):
+        """Test that nothing is fetched when the whole chain is cached."""
+        scanner.folder_cache = {"folder_a": {"name": "A", "parent": None}}
+
+        scanner._resolve_ancestors([{"id": "file1", "parents": ["folder_a"]}])
+
+        mock_drive_service.get_file_metadata_batch.assert_not_called()
+
+    def test_resolve_ancestors_stops_on_failed_lookups(self, mock_drive_service, scanner):
+        """Test that folders the batch could not fetch are not requested again."""
+        mock_drive_service.get_file_metadata_batch.return_value = {}
+
+        scanner._resolve_ancestors([{"id": "file1", "parents": ["missing"]}])
+
+        mock_drive_service.get_file_metadata_batch.assert_called_once()
+        assert scanner.folder_cache == {}
+
+    def test_resolve_ancestors_handles_api_error(self, mock_drive_service, scanner):
+        """Test that a failed batch leaves path building to the fallback."""
+        mock_drive_service.get_file_metadata_batch.side_effect = DriveServiceError("Rate limited")
+
+        scanner._resolve_ancestors([{"id": "file1", "parents": ["folder_a"]}])
+
+        assert scanner.folder_cache == {}
+
+    def test_resolve_ancestors_handles_circular_cache(self, mock_drive_service, scanner):
+        """Test that a loop in the cached hierarchy does not hang."""
+        scanner.folder_cache = {
+            "folder_a": {"name": "A", "parent": "folder_b"},
+            "folder_b": {"name": "B", "parent": "folder_a"},
+        }
+
+        scanner._resolve_ancestors([{"id": "file1", "parents": ["folder_a"]}])
+
+        mock_drive_service.get_file_metadata_batch.assert_not_called()
+
+
+def _listing(files, next_page_token=None):
+    """Build a Drive listing response."""
+    return {"files": files, "nextPageToken": next_page_token}
+
+
+def _mock_drive_service(folders=None, files=None):
+    """
+    Build a Drive service mock that serves listings per parent folder.
+
+    Args:
+        folders: Maps a parent folder ID to the subfolders listed under it
+        files: Maps a parent folder ID to the non-folder files listed under it
+    """
+    folders = folders or {}
+    files = files or {}
+    mock_drive_service = MagicMock()
+    mock_drive_service.list_folders.side_effect = lambda folder_id, page_token: _listing(
+        folders.get(folder_id, [])
+    )
+    mock_drive_service.list_files.side_effect = lambda folder_id, page_token, **filters: _listing(
+        files.get(folder_id, [])
+    )
+    return mock_drive_service
+
 
 class TestScanDrive:
     """Tests for the scan_drive method."""
 
     def test_scan_drive_empty_results(self):
         """Test scanning drive with no files."""
-        mock_drive_service = MagicMock()
-        mock_drive_service.list_files.return_value = {"files": [], "nextPageToken": None}
+        mock_drive_service = _mock_drive_service()
 
         scanner = DriveScanner(mock_drive_service)
         result = scanner.scan_drive()
 
         assert result == []
         mock_drive_service.list_files.assert_called_once()
+        mock_drive_service.list_folders.assert_called_once()
+
+    def test_iter_drive_yields_files_lazily(self):
+        """Test that iter_drive only lists folders as results are consumed."""
+        mock_drive_service = _mock_drive_service(
+            files={None: [{"id": "file1", "name": "document.pdf", "mimeType": "application/pdf"}]}
+        )
+
+        scanner = DriveScanner(mock_drive_service)
+        files = scanner.iter_drive()
+
+        mock_drive_service.list_files.assert_not_called()
+        assert next(files)["id"] == "file1"
+        assert list(files) == []
 
     def test_scan_drive_single_file(self):
         """Test scanning drive with a single file."""
-        mock_drive_service = MagicMock()
-        mock_drive_service.list_files.return_value = {
-            "files": [
-                {
-                    "id": "file1",
-                    "name": "document.pdf",
-                    "mimeType": "application/pdf",
-                    "size": "2048",
-                    "createdTime": "2024-01-15T10:00:00.000Z",
-                    "webViewLink": "https://drive.google.com/file/d/file1/view",
-                }
-            ],
-            "nextPageToken": None,
-        }
+        mock_drive_service = _mock_drive_service(
+            files={
+                None: [
+                    {
+                        "id": "file1",
+                        "name": "document.pdf",
+                        "mimeType": "application/pdf",
+                        "size": "2048",
+                        "createdTime": "2024-01-15T10:00:00.000Z",
+                        "webViewLink": "https://drive.google.com/file/d/file1/view",
+                    }
+                ]
+            }
+        )
 
         scanner = DriveScanner(mock_drive_service)
         result = scanner.scan_drive()
@@ -289,75 +476,92 @@ class TestScanDrive:
         assert result[0]["id"] == "file1"
         assert result[0]["name"] == "document.pdf"
 
+    def test_scan_drive_fetches_media_metadata_for_videos_only(self):
+        """Test that media metadata is only fetched for video files."""
+        mock_drive_service = _mock_drive_service(
+            files={
+                None: [
+                    {"id": "video1", "name": "clip.mp4", "mimeType": "video/mp4"},
+                    {"id": "file1", "name": "document.pdf", "mimeType": "application/pdf"},
+                ]
+            }
+        )
+        mock_drive_service.get_file_metadata_batch.return_value = {
+            "video1": {"id": "video1", "videoMediaMetadata": {"durationMillis": "5000"}},
+        }
+
+        scanner = DriveScanner(mock_drive_service)
+        result = scanner.scan_drive()
+
+        mock_drive_service.get_file_metadata_batch.assert_called_once_with(
+            ["video1"], fields=DriveScanner.MEDIA_METADATA_FIELDS
+        )
+        assert result[0]["duration_milliseconds"] == "5000"
+        assert result[1]["duration_milliseconds"] == ""
+
     def test_scan_drive_with_folder_id(self):
         """Test scanning specific folder."""
-        mock_drive_service = MagicMock()
-        mock_drive_service.list_files.return_value = {"files": [], "nextPageToken": None}
+        mock_drive_service = _mock_drive_service()
 
         scanner = DriveScanner(mock_drive_service)
         scanner.scan_drive(folder_id="folder123")
 
-        mock_drive_service.list_files.assert_called_with(folder_id="folder123", page_token=None)
-
-    def test_scan_drive_skips_folders(self):
-        """Test that scanning skips folder entries from results (adds to queue)."""
-        mock_drive_service = MagicMock()
-        # First call returns a folder and a file
-        # Second call returns empty (for scanning the folder)
-        mock_drive_service.list_files.side_effect = [
-            {
-                "files": [
-                    {
-                        "id": "folder1",
-                        "name": "My Folder",
-                        "mimeType": "application/vnd.google-apps.folder",
-                    },
+        mock_drive_service.list_files.assert_called_with(
+            folder_id="folder123", page_token=None, exclude_folders=True, exclude_workspace=True
+        )
+        mock_drive_service.list_folders.assert_called_with(folder_id="folder123", page_token=None)
+
+    def test_scan_drive_discovers_folders_separately(self):
+        """Test that folders come from folder listings and are not cataloged."""
+        mock_drive_service = _mock_drive_service(
+            folders={None: [{"id": "folder1", "name": "My Folder"}]},
+            files={
+                None: [
                     {
                         "id": "file1",
                         "name": "document.pdf",
                         "mimeType": "application/pdf",
                         "size": "1024",
-                    },
-                ],
-                "nextPageToken": None,
-            },
-            {
-                "files": [],
-                "nextPageToken": None,
+                    }
+                ]
             },
-        ]
+        )
 
         scanner = DriveScanner(mock_drive_service)
         result = scanner.scan_drive()
 
-        # Should only return the file, not the folder (folder is queued for scanning)
-        assert len(result) == 1
-        assert result[0]["id"] == "file1"
+        # Should only return the file; the folder is queued for scanning
+        assert [f["id"] for f in result] == ["file1"]
+        listed = {call.kwargs["folder_id"] for call in mock_drive_service.list_files.call_args_list}
+        assert listed == {None, "folder1"}
+        for call in mock_drive_service.list_files.call_args_list:
+            assert call.kwargs["exclude_folders"] is True
+            assert call.kwargs["exclude_workspace"] is True
 
     def test_scan_drive_skips_google_workspace_files(self):
         """Test that scanning skips Google Workspace files."""
-        mock_drive_service = MagicMock()
-        mock_drive_service.list_files.return_value = {
-            "files": [
-                {
-                    "id": "doc1",
-                    "name": "My Document",
-                    "mimeType": "application/vnd.google-apps.document",
-                },
-                {
-                    "id": "sheet1",
-                    "name": "My Spreadsheet",
-                    "mimeType": "application/vnd.google-apps.spreadsheet",
-                },
-                {
-                    "id": "file1",
-                    "name": "real_file.pdf",
-                    "mimeType": "application/pdf",
-                    "size": "1024",
-                },
-            ],
-            "nextPageToken": None,
-        }
+        mock_drive_service = _mock_drive_service(
+            files={
+                None: [
+                    {
+                        "id": "doc1",
+                        "name": "My Document",
+                        "mimeType": "application/vnd.google-apps.document",
+                    },
+                    {
+                        "id": "sheet1",
+                        "name": "My Spreadsheet",
+                        "mimeType": "application/vnd.google-apps.spreadsheet",
+                    },
+                    {
+                        "id": "file1",
+                        "name": "real_file.pdf",
+                        "mimeType": "application/pdf",
+                        "size": "1024",
+                    },
+                ]
+            }
+        )
 
         scanner = DriveScanner(mock_drive_service)
         result = scanner.scan_drive()
@@ -368,78 +572,43 @@ class TestScanDrive:
 
     def test_scan_drive_recursive_folder_scanning(self):
         """Test that scanning discovers and scans subfolders."""
-        mock_drive_service = MagicMock()
-
-        # First call returns a folder and a file
-        # Second call (for subfolder) returns another file
-        mock_drive_service.list_files.side_effect = [
-            {
-                "files": [
-                    {
-                        "id": "subfolder1",
-                        "name": "Subfolder",
-                        "mimeType": "application/vnd.google-apps.folder",
-                    },
+        mock_drive_service = _mock_drive_service(
+            folders={None: [{"id": "subfolder1", "name": "Subfolder"}]},
+            files={
+                None: [
                     {
                         "id": "file1",
                         "name": "root_file.pdf",
                         "mimeType": "application/pdf",
                         "size": "1024",
-                    },
+                    }
                 ],
-                "nextPageToken": None,
-            },
-            {
-                "files": [
+                "subfolder1": [
                     {
                         "id": "file2",
                         "name": "subfolder_file.pdf",
                         "mimeType": "application/pdf",
                         "size": "2048",
-                    },
+                    }
                 ],
-                "nextPageToken": None,
             },
-        ]
+        )
 
         scanner = DriveScanner(mock_drive_service)
         result = scanner.scan_drive()
 
-        # Should return both files
-        assert len(result) == 2
-        file_ids = [f["id"] for f in result]
-        assert "file1" in file_ids
-        assert "file2" in file_ids
+        # Files keep the discovery order
+        assert [f["id"] for f in result] == ["file1", "file2"]
 
     def test_scan_drive_pagination(self):
         """Test that scanning handles pagination correctly."""
-        mock_drive_service = MagicMock()
-
-        # First page with continuation token
-        # Second page (final)
+        mock_drive_service = _mock_drive_service()
         mock_drive_service.list_files.side_effect = [
-            {
-                "files": [
-                    {
-                        "id": "file1",
-                        "name": "page1_file.pdf",
-                        "mimeType": "application/pdf",
-                        "size": "1024",
-                    },
-                ],
-                "nextPageToken": "token_page2",
-            },
-            {
-                "files": [
-                    {
-                        "id": "file2",
-                        "name": "page2_file.pdf",
-                        "mimeType": "application/pdf",
-                        "size": "2048",
-                    },
-                ],
-                "nextPageToken": None,
-            },
+            _listing(
+                [{"id": "file1", "name": "page1_file.pdf", "mimeType": "application/pdf"}],
+                next_page_token="token_page2",
+            ),
+            _listing([{"id": "file2", "name": "page2_file.pdf", "mimeType": "application/pdf"}]),
         ]
 
         scanner = DriveScanner(mock_drive_service)
@@ -449,72 +618,53 @@ class TestScanDrive:
         # Verify pagination token was used
         calls = mock_drive_service.list_files.call_args_list
         assert len(calls) == 2
-        assert calls[1][1]["page_token"] == "token_page2"
+        assert calls[1].kwargs["page_token"] == "token_page2"
+
+    def test_scan_drive_folder_pagination(self):
+        """Test that folder discovery follows every page."""
+        mock_drive_service = _mock_drive_service(
+            files={"folder_b": [{"id": "file1", "name": "b.pdf", "mimeType": "application/pdf"}]}
+        )
+        mock_drive_service.list_folders.side_effect = lambda folder_id, page_token: (
+            _listing([{"id": "folder_a", "name": "A"}], next_page_token="token_page2")
+            if folder_id is None and page_token is None
+            else _listing([{"id": "folder_b", "name": "B"}] if folder_id is None else [])
+        )
+
+        scanner = DriveScanner(mock_drive_service)
+        result = scanner.scan_drive()
+
+        assert [f["id"] for f in result] == ["file1"]
+        assert set(scanner.folder_cache) == {"folder_a", "folder_b"}
 
     def test_scan_drive_avoids_duplicate_folder_scans(self):
         """Test that scanning doesn't scan the same folder twice."""
-        mock_drive_service = MagicMock()
-
-        # First call returns a folder that references back to root
-        mock_drive_service.list_files.side_effect = [
-            {
-                "files": [
-                    {
-                        "id": "subfolder1",
-                        "name": "Subfolder",
-                        "mimeType": "application/vnd.google-apps.folder",
-                    },
-                ],
-                "nextPageToken": None,
-            },
-            {
-                "files": [],
-                "nextPageToken": None,
-            },
-        ]
+        # The subfolder lists the root again, as a shortcut or loop would
+        mock_drive_service = _mock_drive_service(
+            folders={
+                "root": [{"id": "subfolder1", "name": "Subfolder"}],
+                "subfolder1": [{"id": "root", "name": "Root"}],
+            }
+        )
 
         scanner = DriveScanner(mock_drive_service)
-        scanner.scan_drive()
+        scanner.scan_drive(folder_id="root")
 
-        # Should only call list_files twice (root + subfolder)
+        # Should only list root and subfolder once each
         assert mock_drive_service.list_files.call_count == 2
+        assert mock_drive_service.list_folders.call_count == 2
 
     def test_scan_drive_caches_folder_metadata(self):
         """Test that folder metadata is cached during scanning to avoid N+1 API calls."""
-        mock_drive_service = MagicMock()
-
         # Simulating a nested folder structure: root -> parent_folder -> child_folder
-        mock_drive_service.list_files.side_effect = [
-            # Root level: contains parent_folder
-            {
-                "files": [
-                    {
-                        "id": "parent_folder",
-                        "name": "Parent",
-                        "mimeType": "application/vnd.google-apps.folder",
-                        "parents": ["root_id"],
-                    },
+        mock_drive_service = _mock_drive_service(
+            folders={
+                None: [{"id": "parent_folder", "name": "Parent", "parents": ["root_id"]}],
+                "parent_folder": [
+                    {"id": "child_folder", "name": "Child", "parents": ["parent_folder"]}
                 ],
-                "nextPageToken": None,
-            },
-            # parent_folder level: contains child_folder
-            {
-                "files": [
-                    {
-                        "id": "child_folder",
-                        "name": "Child",
-                        "mimeType": "application/vnd.google-apps.folder",
-                        "parents": ["parent_folder"],
-                    },
-                ],
-                "nextPageToken": None,
-            },
-            # child_folder level: empty
-            {
-                "files": [],
-                "nextPageToken": None,
-            },
-        ]
+            }
+        )
 
         scanner = DriveScanner(mock_drive_service)
         scanner.scan_drive()
@@ -529,41 +679,24 @@ class TestScanDrive:
 
     def test_scan_drive_uses_cached_folders_for_paths(self):
         """Test that cached folder metadata is used when building file paths."""
-        mock_drive_service = MagicMock()
-
-        # Simulate scanning a folder structure with files
-        mock_drive_service.list_files.side_effect = [
-            # Root level: contains parent_folder
-            {
-                "files": [
-                    {
-                        "id": "parent_folder",
-                        "name": "Documents",
-                        "mimeType": "application/vnd.google-apps.folder",
-                        "parents": ["root_id"],
-                    },
-                ],
-                "nextPageToken": None,
-            },
-            # parent_folder level: contains a file
-            {
-                "files": [
+        mock_drive_service = _mock_drive_service(
+            folders={None: [{"id": "parent_folder", "name": "Documents", "parents": ["root_id"]}]},
+            files={
+                "parent_folder": [
                     {
                         "id": "file1",
                         "name": "report.pdf",
                         "mimeType": "application/pdf",
                         "size": "1024",
                         "parents": ["parent_folder"],
-                    },
-                ],
-                "nextPageToken": None,
+                    }
+                ]
             },
-        ]
+        )
 
-        # Mock the API for fetching root folder (for path building)
-        mock_drive_service.service.files().get().execute.return_value = {
-            "name": "My Drive",
-            "parents": [],
+        # The root folder above the scan is fetched once for path building
+        mock_drive_service.get_file_metadata_batch.return_value = {
+            "root_id": {"id": "root_id", "name": "My Drive"},
         }
 
         scanner = DriveScanner(mock_drive_service)
@@ -573,32 +706,32 @@ class TestScanDrive:
         assert len(result) == 1
         assert result[0]["name"] == "report.pdf"
 
-        # The path should contain the folder name from cache
-        assert "Documents" in result[0]["path"]
+        # The path is built from the cache without per-folder requests
+        assert result[0]["path"] == "/My Drive/Documents/report.pdf"
+        mock_drive_service.get_file_metadata_batch.assert_called_once_with(
+            ["root_id"], fields=DriveScanner.FOLDER_METADATA_FIELDS
+        )
+        mock_drive_service.get_file_metadata.assert_not_called()
 
         # Verify that parent_folder was cached (reducing API calls)
         assert "parent_folder" in scanner.folder_cache
 
     def test_scan_drive_handles_folder_without_id(self):
         """Test that scanning handles folders without an id gracefully."""
-        mock_drive_service = MagicMock()
-
         # Returns a folder without 'id' field (edge case)
-        mock_drive_service.list_files.return_value = {
-            "files": [
-                {
-                    "name": "FolderWithoutId",
-                    "mimeType": "application/vnd.google-apps.folder",
-                },
-                {
-                    "id": "file1",
-                    "name": "document.pdf",
-                    "mimeType": "application/pdf",
-                    "size": "1024",
-                },
-            ],
-            "nextPageToken": None,
-        }
+        mock_drive_service = _mock_drive_service(
+            folders={None: [{"name": "FolderWithoutId"}]},
+            files={
+                None: [
+                    {
+                        "id": "file1",
+                        "name": "document.pdf",
+                        "mimeType": "application/pdf",
+                        "size": "1024",
+                    }
+                ]
+            },
+        )
 
         scanner = DriveScanner(mock_drive_service)
         result = scanner.scan_drive()
@@ -608,3 +741,108 @@ class TestScanDrive:
         assert result[0]["id"] == "file1"
         # Folder without id should not be in cache
         assert len(scanner.folder_cache) == 0
+
+    def test_scan_drive_lists_sibling_folders_concurrently(self):
+        """Test that folders on the same level are listed at the same time."""
+        mock_drive_service = _mock_drive_service(
+            folders={None: [{"id": "folder_a", "name": "A"}, {"id": "folder_b", "name": "B"}]}
+        )
+        # Both sibling listings must be in flight for the barrier to release
+        barrier = threading.Barrier(2, timeout=5)
+
+        def list_files(folder_id, page_token, **filters):
+            if folder_id is None:
+                return _listing([])
+            barrier.wait()
+            return _listing(
+                [
+                    {
+                        "id": f"file_in_{folder_id}",
+                        "name": "file.pdf",
+                        "mimeType": "application/pdf",
+                        "parents": [folder_id],
+                    }
+                ]
+            )
+
+        mock_drive_service.list_files.side_effect = list_files
+
+        scanner = DriveScanner(mock_drive_service, max_workers=2)
+        result = scanner.scan_drive()
+
+        # Results keep the discovery order regardless of completion order
+        assert [f["id"] for f in result] == ["file_in_folder_a", "file_in_folder_b"]
+        assert result[0]["path"] == "/A/file.pdf"
+
+    def test_scan_drive_discovery_does_not_wait_for_file_listings(self):
+        """Test that subfolders are discovered while a large folder is still listed."""
+        mock_drive_service = _mock_drive_service(
+            folders={"root": [{"id": "child", "name": "Child"}]}
+        )
+        child_discovered = threading.Event()
+
+        def list_folders(folder_id, page_token):
+            if folder_id == "child":
+                child_discovered.set()
+            return _listing([{"id": "child", "name": "Child"}] if folder_id == "root" else [])
+
+        def list_files(folder_id, page_token, **filters):
+            # The root's files only finish once the next level is being discovered
+            if folder_id == "root":
+                assert child_discovered.wait(timeout=5)
+            return _listing([])
+
+        mock_drive_service.list_folders.side_effect = list_folders
+        mock_drive_service.list_files.side_effect = list_files
+
+        scanner = DriveScanner(mock_drive_service, max_workers=2)
+        assert scanner.scan_drive(folder_id="root") == []
+
+    def test_iter_drive_bounds_pending_listings(self):
+        """Test that file listings do not run far ahead of the consumer."""
+        folder_ids = [f"folder_{i}" for i in range(10)]
+        mock_drive_service = _mock_drive_service(
+            folders={None: [{"id": folder_id, "name": folder_id} for folder_id in folder_ids]},
+            files={
+                folder_id: [{"id": f"file_{folder_id}", "name": "a.pdf", "mimeType": "a/b"}]
+                for folder_id in folder_ids
+            },
+        )
+
+        scanner = DriveScanner(mock_drive_service, max_workers=1)
+        files = scanner.iter_drive()
+        next(files)
+
+        # Root plus at most two outstanding listings per worker
+        assert mock_drive_service.list_files.call_count <= 3
+        files.close()
+
+    def test_iter_drive_close_cancels_queued_listings(self):
+        """Test that stopping early does not list the remaining folders."""
+        folder_ids = [f"folder_{i}" for i in range(10)]
+        mock_drive_service = _mock_drive_service(
+            folders={None: [{"id": folder_id, "name": folder_id} for folder_id in folder_ids]},
+            files={None: [{"id": "file1", "name": "a.pdf", "mimeType": "application/pdf"}]},
+        )
+
+        scanner = DriveScanner(mock_drive_service, max_workers=1)
+        files = scanner.iter_drive()
+        next(files)
+        files.close()
+
+        assert mock_drive_service.list_files.call_count < len(folder_ids) + 1
+
+
+class TestCatalogFiles:
+    """Tests for the _catalog_files method."""
+
+    def test_catalog_files_skips_google_workspace_files(self, scanner):
+        """Test that only regular files become catalog entries."""
+        files = [
+            {"id": "doc1", "name": "Doc", "mimeType": "application/vnd.google-apps.document"},
+            {"id": "file1", "name": "a.pdf", "mimeType": "application/pdf"},
+        ]
+
+        result = list(scanner._catalog_files(files))
+
+        assert [f["id"] for f in result] == ["file1"]